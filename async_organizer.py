@@ -0,0 +1,136 @@
+"""
+async_organizer.py — asyncio variant of organize_files for high-latency storage.
+
+On SMB / NFS every mkdir, stat, listdir and rename is a network round trip,
+so the thread pool spends nearly all its time waiting. What matters is how
+many requests are in flight, not CPU: here every blocking call runs on a
+large thread pool, a semaphore caps how many are outstanding (thousands is
+fine), and the event loop only does the bookkeeping.
+
+    results = asyncio.run(organize_files_async(files, "organized", concurrency=2048))
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable
+
+import metrics
+from copier import copy_file
+from organizer import _DestinationFolder, _MovePlanner, _move_single, organize_files
+
+ASYNC_CONCURRENCY = 1024  # Blocking file operations in flight at once
+
+
+def _stat_dev(directory: str) -> int | None:
+    if metrics.ENABLED:
+        metrics.syscall("stat")
+    try:
+        return os.stat(directory).st_dev
+    except OSError:
+        return None
+
+
+async def organize_files_async(files: Iterable[dict], output_dir: str,
+                               dry_run: bool = False,
+                               concurrency: int = ASYNC_CONCURRENCY,
+                               progress: Callable[[int], None] | None = None,
+                               on_result: Callable[[dict], None] | None = None,
+                               keep_results: bool = True,
+                               journal=None,
+                               placement=None) -> list[dict]:
+    """
+    Same moves and result dicts as organizer.organize_files, with up to
+    `concurrency` blocking file operations in flight at once.
+    Ordering guarantees per destination folder: it is created and listed
+    exactly once, before any move into it starts, and names inside it are
+    settled in input order, so collisions get the same suffixes as
+    organize_files would give them.
+    progress(n) is called from worker threads; on_result(result) is called
+    on the event loop as each move completes. With a journal
+    (journal.MoveJournal) all destinations are settled and journaled
+    first, then the moves start. placement works as in organize_files.
+    """
+    if dry_run:
+        return organize_files(files, output_dir, dry_run=True, on_result=on_result,
+                              keep_results=keep_results, placement=placement)
+
+    loop = asyncio.get_running_loop()
+    limit = asyncio.Semaphore(max(concurrency, 1))
+    results: list[dict] = []
+    folders: dict[str, asyncio.Future] = {}
+    source_devs: dict[str, asyncio.Future] = {}
+
+    copier = None
+    if progress is not None:
+        def copier(src: str, dest: str) -> None:
+            copy_file(src, dest, progress)
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+
+        async def blocking(fn, *args):
+            async with limit:
+                return await loop.run_in_executor(pool, fn, *args)
+
+        def folder(path: str) -> asyncio.Future:
+            if path not in folders:
+                folders[path] = asyncio.ensure_future(blocking(_DestinationFolder, path))
+            return folders[path]
+
+        def source_dev(path: str) -> asyncio.Future:
+            directory = os.path.dirname(path)
+            if directory not in source_devs:
+                source_devs[directory] = asyncio.ensure_future(blocking(_stat_dev, directory))
+            return source_devs[directory]
+
+        async def move(f: dict, dest_path: str, same_device: bool) -> None:
+            # The permit was taken before this task was created
+            try:
+                result = await loop.run_in_executor(
+                    pool, _move_single, f, dest_path, same_device, copier, progress
+                )
+            finally:
+                limit.release()
+            if journal is not None:
+                journal.record(result)
+            if keep_results:
+                results.append(result)
+            if on_result is not None:
+                on_result(result)
+
+        with metrics.stage("move"):
+            files = list(files)
+            if placement is not None:
+                placement.prepare(files)
+            directory = _MovePlanner(output_dir, placement).directory
+            targets = [directory(f) for f in files]
+            # Every folder setup and source-dir stat goes out at once...
+            for f, target in zip(files, targets):
+                folder(target)
+                source_dev(f["path"])
+
+            # ...then destinations are settled in input order as they land
+            async def planned():
+                for f, path in zip(files, targets):
+                    target = await folder(path)
+                    dest_path = target.reserve(f.get("new_name", f["name"]))
+                    same_device = target.dev is not None and await source_dev(f["path"]) == target.dev
+                    yield f, dest_path, same_device
+
+            tasks = []
+
+            async def start(planned_move: tuple[dict, str, bool]) -> None:
+                await limit.acquire()  # Bounds pending tasks, not just threads
+                tasks.append(asyncio.ensure_future(move(*planned_move)))
+
+            if journal is None:
+                async for planned_move in planned():
+                    await start(planned_move)
+            else:
+                # Journal every plan (grouped fsyncs, off the loop) before any move starts
+                plans = [p async for p in planned()]
+                for planned_move in await loop.run_in_executor(pool, list, journal.plan(plans)):
+                    await start(planned_move)
+            await asyncio.gather(*tasks)
+
+    return results
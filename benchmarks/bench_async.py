@@ -0,0 +1,95 @@
+"""
+bench_async.py — Thread pool vs asyncio organize on a simulated network mount.
+
+Wraps the os calls the organizer makes (mkdir, stat, listdir, rename,
+remove) so each one sleeps for a fixed round trip before running, then
+moves the same set of files with organize_files (default and 'network'
+policies) and organize_files_async.
+
+Run from the project root:  python benchmarks/bench_async.py [count] [latency_ms]
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_organizer import organize_files_async  # noqa: E402
+from organizer import ExecutionPolicy, organize_files  # noqa: E402
+
+CATEGORIES = ["Images", "Documents", "Videos", "Audio", "Code", "Archives"]
+SLOW_CALLS = ("mkdir", "stat", "listdir", "rename", "remove")
+
+
+@contextmanager
+def injected_latency(seconds: float):
+    """Every call in SLOW_CALLS pays `seconds` before it runs."""
+    originals = {name: getattr(os, name) for name in SLOW_CALLS}
+
+    def slow(fn):
+        def call(*args, **kwargs):
+            time.sleep(seconds)
+            return fn(*args, **kwargs)
+        return call
+
+    for name, fn in originals.items():
+        setattr(os, name, slow(fn))
+    try:
+        yield
+    finally:
+        for name, fn in originals.items():
+            setattr(os, name, fn)
+
+
+def make_files(root: str, count: int) -> list[dict]:
+    files = []
+    for i in range(count):
+        directory = os.path.join(root, f"dir{i % 50:02d}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"file{i:05d}.dat")
+        with open(path, "wb") as fh:
+            fh.write(b"x" * 64)
+        files.append({
+            "name": os.path.basename(path), "path": path, "extension": ".dat",
+            "size_bytes": 64, "modified": "2024-01-01",
+            "category": CATEGORIES[i % len(CATEGORIES)], "new_name": f"f{i:05d}.dat",
+        })
+    return files
+
+
+def bench(label: str, count: int, latency: float, run) -> None:
+    work = tempfile.mkdtemp(prefix="organizer-async-")
+    try:
+        files = make_files(os.path.join(work, "src"), count)
+        out = os.path.join(work, "out")
+        with injected_latency(latency):
+            start = time.perf_counter()
+            results = run(files, out)
+            elapsed = time.perf_counter() - start
+        ok = sum(1 for r in results if r["status"] == "success")
+        print(f"  {label:<26} {elapsed:8.3f} s  {count / elapsed:10.0f} files/s  ({ok}/{count} ok)")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 5.0) / 1000
+    print(f"{count} moves, {latency * 1000:.1f} ms per file system call")
+
+    bench("threads (8)", count, latency,
+          lambda files, out: organize_files(files, out))
+    bench("threads (network preset)", count, latency,
+          lambda files, out: organize_files(files, out, policy=ExecutionPolicy.for_storage("network")))
+    for concurrency in (256, 1024):
+        bench(f"asyncio ({concurrency})", count, latency,
+              lambda files, out, c=concurrency: asyncio.run(organize_files_async(files, out, concurrency=c)))
+
+
+if __name__ == "__main__":
+    main()
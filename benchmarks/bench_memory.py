@@ -0,0 +1,64 @@
+"""
+bench_memory.py — Bytes per file for dict records vs FileRecord.
+
+Run from the project root:  python benchmarks/bench_memory.py [count]
+"""
+
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classifier import classify_all  # noqa: E402
+from records import FileRecord  # noqa: E402
+from renamer import assign_new_names  # noqa: E402
+
+EXTS = [".js"] * 8 + [".json", ".md", ".png", ".pdf", ".ts", ".css", ""]
+
+
+def raw_fields(count: int, seed: int = 42) -> list[tuple]:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        ext = rng.choice(EXTS)
+        name = f"file{i}{ext}"
+        # Build fresh strings the way os.scandir / strftime would
+        rows.append((
+            name,
+            f"/data/project/node_modules/pkg{i % 500}/{name}",
+            "".join([ext]),
+            rng.randint(0, 1 << 20),
+            "".join(["2026-02-", str(10 + i % 20)]),
+        ))
+    return rows
+
+
+def as_dict(row: tuple) -> dict:
+    name, path, ext, size, modified = row
+    return {"name": name, "path": path, "extension": ext,
+            "size_bytes": size, "modified": modified}
+
+
+def measure(factory, rows: list[tuple]) -> float:
+    tracemalloc.start()
+    records = [factory(row) for row in rows]
+    classify_all(records)
+    assign_new_names(records)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / len(rows)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rows = raw_fields(count)
+    before = measure(as_dict, rows)
+    after = measure(lambda row: FileRecord(*row), rows)
+    print(f"dict records   {before:8.0f} bytes/file")
+    print(f"FileRecord     {after:8.0f} bytes/file  ({1 - after / before:.0%} smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+bench_rules.py — Per-file cost of user rules as the rule count grows.
+Compares checking every rule in order with the compiled extension index.
+
+Run from the project root:  python benchmarks/bench_rules.py [files] [rules]
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rules import RuleSet  # noqa: E402
+
+EXTS = [".jpg", ".png", ".pdf", ".docx", ".mp4", ".mp3", ".py", ".js", ".zip",
+        ".txt", ".csv", ".bin", ".iso", ".cr2", ".nef", ""]
+
+
+def synthetic_rules(count: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    rules = []
+    for i in range(count):
+        rule = {"category": f"Rule{i:03d}", "extensions": [f".x{i:03d}", rng.choice(EXTS)]}
+        if rng.random() < 0.7:
+            rule["name"] = f"proj{i:03d}_|client{i:03d}"
+        if rng.random() < 0.3:
+            rule["min_size"] = rng.randint(1, 100) * 1024
+        rules.append(rule)
+    rules.append({"category": "Huge", "min_size": "4GB"})  # One catch-all
+    return rules
+
+
+def synthetic_files(count: int, seed: int = 42) -> list[dict]:
+    rng = random.Random(seed)
+    return [{
+        "name": f"{rng.choice(['img', 'doc', 'proj007_', 'client123'])}_{i}{ext}",
+        "extension": ext, "path": f"/data/{i}{ext}",
+        "size_bytes": rng.randint(0, 10 ** 6), "modified": "2024-05-01",
+    } for i, ext in ((i, rng.choice(EXTS)) for i in range(count))]
+
+
+def linear_match(rules: list[dict], compiled: list, f: dict) -> str | None:
+    """What a straightforward engine does: every rule, every file."""
+    name = f["name"].lower()
+    for rule, regex in zip(rules, compiled):
+        if "extensions" in rule and f["extension"] not in rule["extensions"]:
+            continue
+        if f["size_bytes"] < rule.get("min_size", 0):
+            continue
+        if regex is not None and not regex.search(name):
+            continue
+        return rule["category"]
+    return None
+
+
+def main() -> None:
+    n_files = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    n_rules = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    rules = synthetic_rules(n_rules)
+    files = synthetic_files(n_files)
+
+    start = time.perf_counter()
+    ruleset = RuleSet.from_rules(rules)
+    print(f"{n_rules + 1} rules compiled in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    normalized = [dict(r, min_size=4 * 1024 ** 3) if r["category"] == "Huge" else r for r in rules]
+    compiled = [re.compile(r["name"]) if "name" in r else None for r in normalized]
+    start = time.perf_counter()
+    expected = [linear_match(normalized, compiled, f) for f in files]
+    linear = time.perf_counter() - start
+
+    start = time.perf_counter()
+    got = [ruleset.match(f) for f in files]
+    indexed = time.perf_counter() - start
+
+    assert got == expected, "compiled rules disagree with the linear scan"
+    print(f"  linear   {linear / n_files * 1e6:8.2f} µs/file")
+    print(f"  indexed  {indexed / n_files * 1e6:8.2f} µs/file  ({linear / indexed:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
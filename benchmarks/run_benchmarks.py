@@ -0,0 +1,134 @@
+"""
+run_benchmarks.py — Times every pipeline stage on a synthetic tree.
+
+Builds a reproducible tree (see synth_tree.py) on tmpfs when available,
+times scan, classify, rename, organize (dry run and real) and both report
+writers, and writes a JSON results file that can be diffed across commits.
+
+    python benchmarks/run_benchmarks.py --files 27000 --out bench.json
+    python benchmarks/run_benchmarks.py --compare bench.json --out new.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from classifier import classify_all  # noqa: E402
+from organizer import organize_files  # noqa: E402
+from renamer import assign_new_names  # noqa: E402
+from reporter import build_report, save_html_report, save_json_report  # noqa: E402
+from scanner import scan_directory  # noqa: E402
+from synth_tree import DEFAULT_EXT_MIX, generate_tree, load_ext_mix  # noqa: E402
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _timed(results: dict, name: str, count: int, fn, *args, **kwargs):
+    start = time.perf_counter()
+    value = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    results[name] = {
+        "seconds": round(elapsed, 6),
+        "files_per_second": round(count / elapsed, 1) if elapsed else None,
+    }
+    print(f"  {name:<14} {elapsed:8.3f} s  {count / elapsed if elapsed else 0:12.0f} files/s")
+    return value
+
+
+def run(args: argparse.Namespace) -> dict:
+    base = args.tmpdir or ("/dev/shm" if os.path.isdir("/dev/shm") else None)
+    work = tempfile.mkdtemp(prefix="organizer-bench-", dir=base)
+    # The mix goes into the results so every tree can be rebuilt exactly
+    ext_mix = load_ext_mix(args.ext_mix) if args.ext_mix else dict(DEFAULT_EXT_MIX)
+    tree_args = dict(files=args.files, depth=args.depth, fanout=args.fanout,
+                     repeat_ratio=args.repeat_ratio, ext_mix=ext_mix,
+                     large_files=args.large_files, large_size=args.large_size,
+                     seed=args.seed)
+    results: dict = {}
+    try:
+        src = os.path.join(work, "src")
+        out = os.path.join(work, "out")
+        print(f"Generating {args.files} files in {src}…")
+        generate_tree(src, **tree_args)
+
+        files = _timed(results, "scan", args.files, scan_directory, src)
+        _timed(results, "classify", len(files), classify_all, files)
+        _timed(results, "rename", len(files), assign_new_names, files)
+        dry = _timed(results, "organize_dry", len(files), organize_files, files, out, dry_run=True)
+        report = build_report(files, dry, out)
+        os.makedirs(out, exist_ok=True)
+        _timed(results, "report_json", len(files), save_json_report, report, out)
+        _timed(results, "report_html", len(files), save_html_report, report, out, dry)
+        moved = _timed(results, "organize", len(files), organize_files, files, out)
+        failed = sum(1 for r in moved if r["status"] != "success")
+        if failed:
+            print(f"  warning: {failed} moves failed")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "tmpdir": base or tempfile.gettempdir(),
+        "tree": tree_args,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the organizer pipeline.")
+    parser.add_argument("--files", type=int, default=27_000)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--fanout", type=int, default=8)
+    parser.add_argument("--repeat-ratio", type=float, default=0.5)
+    parser.add_argument("--large-files", type=int, default=3)
+    parser.add_argument("--large-size", type=int, default=1 << 30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--ext-mix", metavar="REPORT_JSON",
+                        help="take the extension mix from an organizer_report.json "
+                             "(default: the built-in table in synth_tree.py)")
+    parser.add_argument("--tmpdir", help="where to build the tree (default: /dev/shm)")
+    parser.add_argument("--out", default="bench_results.json",
+                        help="results file (default: bench_results.json)")
+    parser.add_argument("--compare", metavar="OLD_JSON",
+                        help="print the change against an earlier results file")
+    args = parser.parse_args()
+
+    data = run(args)
+    with open(args.out, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, indent=2)
+    print(f"Results → {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            old = json.load(fh)
+        print(f"Compared with {old.get('commit') or args.compare}:")
+        for name, now in data["results"].items():
+            before = old.get("results", {}).get(name)
+            if before and before["seconds"]:
+                change = now["seconds"] / before["seconds"] - 1
+                print(f"  {name:<14} {change:+8.1%}")
+
+
+if __name__ == "__main__":
+    main()
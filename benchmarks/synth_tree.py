@@ -0,0 +1,123 @@
+"""
+synth_tree.py — Reproducible synthetic directory trees for benchmarks.
+
+The default extension mix is a fixed table taken from a real 27k-file
+run (mostly .js / .ts / .map from node_modules, with a few large
+installers); --ext-mix takes the mix from another organizer_report.json
+instead. Large binaries are created sparse, so they cost no real disk
+space but keep their st_size.
+
+    python benchmarks/synth_tree.py /dev/shm/tree --files 27000 --depth 4
+    python benchmarks/synth_tree.py /dev/shm/tree --ext-mix organized/organizer_report.json
+"""
+
+import argparse
+import json
+import os
+import random
+
+# Extension counts of the sample run; fixed so default trees never change
+DEFAULT_EXT_MIX = {
+    ".js": 11685, ".ts": 4140, ".map": 4139, ".json": 1408, ".md": 1304,
+    ".mjs": 1260, ".mts": 1225, "": 1088, ".tsx": 147, ".yml": 125,
+    ".txt": 61, ".html": 53, ".py": 50, ".png": 22, ".exe": 22,
+    ".docx": 20, ".jpeg": 18, ".pdf": 17, ".pptx": 16, ".css": 15,
+}
+
+# Names repeat heavily in real trees (index.js in every package)
+COMMON_STEMS = ["index", "package", "README", "LICENSE", "main", "utils",
+                "types", "helpers", "config", "CHANGELOG"]
+WORDS = ["core", "parse", "render", "async", "stream", "buffer", "invoice",
+         "lecture", "resume", "screenshot", "backup", "setup", "report",
+         "image", "client", "server", "test", "spec", "module", "data"]
+
+
+def load_ext_mix(report_path: str) -> dict[str, int]:
+    """The extension_breakdown of an organizer_report.json, as an ext_mix."""
+    with open(report_path, encoding="utf-8") as fh:
+        return json.load(fh)["extension_breakdown"]
+
+
+def _name(rng: random.Random, ext: str, repeat_ratio: float) -> str:
+    if rng.random() < repeat_ratio:
+        stem = rng.choice(COMMON_STEMS)
+    else:
+        stem = "_".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+        stem += f"_{rng.randint(0, 9999)}"
+    return f"{stem}{ext}"
+
+
+def generate_tree(
+    root: str,
+    files: int = 10_000,
+    depth: int = 4,
+    fanout: int = 8,
+    repeat_ratio: float = 0.5,
+    ext_mix: dict[str, int] | None = None,
+    large_files: int = 3,
+    large_size: int = 1 << 30,
+    seed: int = 42,
+) -> list[str]:
+    """
+    Creates `files` files under root spread over a tree `depth` levels deep
+    with up to `fanout` subdirectories per level. repeat_ratio is the share
+    of files named after a handful of common stems; ext_mix maps extension
+    to relative weight. `large_files` of them are sparse `.exe` files of
+    `large_size` bytes. Same arguments + seed → same tree.
+    Returns the list of created paths.
+    """
+    rng = random.Random(seed)
+    mix = ext_mix or DEFAULT_EXT_MIX
+    exts, weights = list(mix), list(mix.values())
+
+    dirs = [root]
+    frontier = [root]
+    for _ in range(depth):
+        next_frontier = []
+        for parent in frontier:
+            for i in range(rng.randint(1, fanout)):
+                next_frontier.append(os.path.join(parent, f"pkg_{len(dirs)}_{i}"))
+                dirs.append(next_frontier[-1])
+        frontier = next_frontier
+    for d in dirs:
+        os.makedirs(d, exist_ok=True)
+
+    created = []
+    for i in range(files):
+        large = i < large_files
+        ext = ".exe" if large else rng.choices(exts, weights)[0]
+        directory = rng.choice(dirs)
+        path = os.path.join(directory, _name(rng, ext, repeat_ratio))
+        if os.path.exists(path):
+            path = os.path.join(directory, f"{i}_{os.path.basename(path)}")
+        with open(path, "wb") as fh:
+            if large:
+                fh.truncate(large_size)  # Sparse
+            else:
+                fh.write(rng.randbytes(rng.choice((0, 64, 512, 2048, 16384))))
+        created.append(path)
+    return created
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("root")
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--fanout", type=int, default=8)
+    parser.add_argument("--repeat-ratio", type=float, default=0.5)
+    parser.add_argument("--large-files", type=int, default=3)
+    parser.add_argument("--large-size", type=int, default=1 << 30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--ext-mix", metavar="REPORT_JSON",
+                        help="take the extension mix from an organizer_report.json")
+    args = parser.parse_args()
+    mix = load_ext_mix(args.ext_mix) if args.ext_mix else None
+    created = generate_tree(args.root, args.files, args.depth, args.fanout,
+                            args.repeat_ratio, mix, args.large_files,
+                            args.large_size, args.seed)
+    print(f"Created {len(created)} files under {args.root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 
 import re
+from typing import Iterable, Iterator, Sequence
 
 # Extension → Category mapping
 EXTENSION_MAP = {
@@ -85,22 +86,118 @@ KEYWORD_PATTERNS = [
 ]
 
 
+class KeywordMatcher:
+    """
+    Matches all keyword patterns with one combined regex search.
+    Names that match nothing (the common case) cost a single scan. When the
+    leftmost hit belongs to a lower-priority pattern, only the patterns
+    ahead of it are re-checked, so list order still decides the category.
+    """
+
+    def __init__(self, patterns: list[tuple[str, str]]):
+        self.categories = [category for _, category in patterns]
+        self._compiled = [re.compile(pattern) for pattern, _ in patterns]
+        self._groups = {f"k{i}": i for i in range(len(patterns))}
+        alternation = "|".join(
+            f"(?P<k{i}>{pattern})" for i, (pattern, _) in enumerate(patterns)
+        )
+        self._combined = re.compile(alternation) if patterns else None
+
+    def match(self, name_lower: str) -> str | None:
+        """Returns the highest-priority category matching the name, if any."""
+        if self._combined is None:
+            return None
+        m = self._combined.search(name_lower)
+        if m is None:
+            return None
+        hit = self._groups[m.lastgroup]
+        for i in range(hit):
+            if self._compiled[i].search(name_lower):
+                return self.categories[i]
+        return self.categories[hit]
+
+
+_KEYWORD_MATCHER = KeywordMatcher(KEYWORD_PATTERNS)
+
+# User rules (rules.RuleSet), tried before the built-in rules when set
+_RULES = None
+
+
+def use_rules(rules) -> None:
+    """
+    Installs a rules.RuleSet for classify_file, iter_classify and
+    classify_all (None removes it). classify_columns only sees names and
+    extensions, so it always applies the built-in rules alone.
+    """
+    global _RULES
+    _RULES = rules
+
+
+def rules_fingerprint() -> str:
+    """Identifies the user rules in effect ('' without any)."""
+    return _RULES.fingerprint if _RULES is not None else ""
+
+
 def classify_file(file_info: dict) -> str:
   
     name_lower = file_info["name"].lower()
     ext = file_info["extension"]
 
-    # 1. Check keyword patterns first (smarter classification)
-    for pattern, category in KEYWORD_PATTERNS:
-        if re.search(pattern, name_lower):
+    # 0. User rules from a rules file, if any
+    if _RULES is not None:
+        category = _RULES.match(file_info)
+        if category is not None:
             return category
 
+    # 1. Check keyword patterns first (smarter classification)
+    category = _KEYWORD_MATCHER.match(name_lower)
+    if category is not None:
+        return category
+
     # 2. Fall back to extension map
     return EXTENSION_MAP.get(ext, "Miscellaneous")
 
 
-def classify_all(files: list[dict]) -> list[dict]:
-    """Adds a 'category' key to each file dict."""
+def iter_classify(files: Iterable[dict]) -> Iterator[dict]:
+    """Adds a 'category' key to each file dict as it streams through."""
     for f in files:
         f["category"] = classify_file(f)
-    return files
\ No newline at end of file
+        yield f
+
+
+def classify_columns(names: Sequence[str], extensions: Sequence[str]) -> list[str]:
+    """
+    Batch classifier over columns: returns one category per (name, extension).
+    Extensions are resolved once per distinct value and keyword matching runs
+    once per distinct lowercased name, so repeated names (index.js and
+    friends) cost a dict lookup. Built-in rules only: user rules need sizes,
+    dates and paths, so classify_all applies them before calling this.
+    """
+    lowered = [name.lower() for name in names]
+    keyword_hits = {key: _KEYWORD_MATCHER.match(key) for key in set(lowered)}
+    ext_categories = {
+        ext: EXTENSION_MAP.get(ext, "Miscellaneous") for ext in set(extensions)
+    }
+    return [
+        keyword_hits[key] or ext_categories[ext]
+        for key, ext in zip(lowered, extensions)
+    ]
+
+
+def classify_all(files: list[dict]) -> list[dict]:
+    """Adds a 'category' key to each file dict."""
+    rest = files
+    if _RULES is not None:
+        rest = []
+        for f in files:
+            category = _RULES.match(f)
+            if category is None:
+                rest.append(f)
+            else:
+                f["category"] = category
+    categories = classify_columns(
+        [f["name"] for f in rest], [f["extension"] for f in rest]
+    )
+    for f, category in zip(rest, categories):
+        f["category"] = category
+    return files
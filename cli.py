@@ -0,0 +1,396 @@
+"""
+cli.py — Headless command-line entry point (no Tk needed).
+
+    python -m cli SOURCE [-o OUTPUT] [--dry-run] [--workers N] ...
+
+Runs scan → classify → rename → organize → report. Modules are imported
+only when the requested stages need them, so startup stays fast.
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+
+import metrics
+
+REPORT_FORMATS = ("json", "json-compact", "html", "ndjson")
+
+logger = logging.getLogger("smart_organizer")
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m cli",
+        description="Scan, classify, rename and organize files without the GUI.",
+    )
+    parser.add_argument("source", nargs="?", help="folder to organize")
+    parser.add_argument("-o", "--output", default="organized",
+                        help="output folder (default: ./organized)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="plan and report only, don't move anything")
+    parser.add_argument("--scan-only", action="store_true",
+                        help="stop after classification and print a summary")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and organize new files as they appear")
+    parser.add_argument("--poll", action="store_true",
+                        help="with --watch: poll directories instead of using inotify")
+    parser.add_argument("--resume", action="store_true",
+                        help="finish the moves an interrupted run left in the output journal")
+    parser.add_argument("--undo", action="store_true",
+                        help="move every journaled file in the output folder back")
+    parser.add_argument("--no-journal", action="store_true",
+                        help="don't keep the crash-safe move journal in the output folder")
+    parser.add_argument("--index", action="store_true",
+                        help="use the incremental scan index in the output folder")
+    parser.add_argument("--scan-workers", type=int, default=1,
+                        help="threads for the directory walk (default: 1, streaming)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="moves in flight at once (default: 8)")
+    parser.add_argument("--storage", choices=("ssd", "hdd", "network"),
+                        help="execution preset for the output storage")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="tune the move thread count from measured throughput")
+    parser.add_argument("--async-io", action="store_true",
+                        help="run moves on asyncio with many requests in flight, for SMB/NFS "
+                             "(--workers sets the limit, default 1024)")
+    parser.add_argument("--copy-processes", type=int, default=0,
+                        help="run cross-device copies in N processes")
+    parser.add_argument("--rules", metavar="FILE",
+                        help="TOML or JSON file of classification rules tried before the built-in ones")
+    parser.add_argument("--sniff", action="store_true",
+                        help="read the first bytes of files with unknown extensions to classify them")
+    parser.add_argument("--large-over", metavar="SIZE",
+                        help="send files at least this big (e.g. 1GB) to a separate folder")
+    parser.add_argument("--large-dir", metavar="DIR",
+                        help="folder for --large-over files, e.g. on another volume "
+                             "(default: OUTPUT/Large Files)")
+    parser.add_argument("--archive-after", metavar="DAYS", type=int,
+                        help="send files not modified for DAYS days to an archive folder")
+    parser.add_argument("--archive-dir", metavar="DIR",
+                        help="folder for --archive-after files (default: OUTPUT/Old Files)")
+    parser.add_argument("--shard-over", metavar="N", type=int,
+                        help="split categories with more than N files (counting files "
+                             "already there) into YYYY/MM subfolders, e.g. 5000")
+    parser.add_argument("--shard", metavar="CATEGORY", action="append", default=[],
+                        help="always split CATEGORY into YYYY/MM subfolders (repeatable)")
+    parser.add_argument("--duplicates", choices=("report", "skip", "hardlink"),
+                        help="detect byte-identical files and handle them")
+    parser.add_argument("--format", default="json,html",
+                        help=f"comma-separated report formats: {', '.join(REPORT_FORMATS)}, "
+                             "or 'none' (default: json,html)")
+    parser.add_argument("--metrics", action="store_true",
+                        help="record per-stage timings and counters into the JSON report")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write per-stage and per-move spans as trace-event JSON "
+                             "(implies --metrics)")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="run under cProfile and dump stats to FILE")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="log every move to stderr")
+    args = parser.parse_args(argv)
+
+    args.formats = set() if args.format == "none" else set(args.format.split(","))
+    unknown = args.formats - set(REPORT_FORMATS)
+    if unknown:
+        parser.error(f"unknown report format: {', '.join(sorted(unknown))}")
+    if args.large_over is not None:
+        from rules import parse_size
+        try:
+            args.large_over = parse_size(args.large_over)
+        except ValueError as e:
+            parser.error(f"--large-over: {e}")
+    if args.resume or args.undo:
+        return args
+    if args.source is None:
+        parser.error("the source folder is required")
+    if not os.path.isdir(args.source):
+        parser.error(f"source folder does not exist: {args.source}")
+    return args
+
+
+def _execution_policy(args: argparse.Namespace):
+    from organizer import ExecutionPolicy
+
+    policy = ExecutionPolicy.for_storage(args.storage) if args.storage else ExecutionPolicy()
+    if args.workers is not None:
+        policy.threads = args.workers
+    if args.adaptive:
+        policy.adaptive = True
+    if args.copy_processes:
+        policy.copy_processes = args.copy_processes
+    return policy
+
+
+def _placement(args: argparse.Namespace):
+    """A PlacementPolicy if any placement option was given, else None."""
+    if not (args.large_over or args.archive_after or args.shard_over is not None or args.shard):
+        return None
+    from placement import PlacementPolicy
+    return PlacementPolicy(
+        large_file_bytes=args.large_over, large_dir=args.large_dir,
+        archive_after_days=args.archive_after, archive_dir=args.archive_dir,
+        shard_threshold=args.shard_over or None, shard_categories=set(args.shard),
+    )
+
+
+def _scan_exclude(args: argparse.Namespace) -> list[str]:
+    """The output folder and any placement tier folders: never scanned as source."""
+    placement = _placement(args)
+    return [args.output] + (placement.tier_dirs() if placement is not None else [])
+
+
+def _collect_files(args: argparse.Namespace) -> list[dict]:
+    """Scan + classify into a list (used when a stage needs every file)."""
+    if args.index:
+        from scan_index import ScanIndex
+        with metrics.stage("scan"), ScanIndex(args.output) as index:
+            files = index.scan(args.source, compact=True, exclude=_scan_exclude(args))
+        _sniff(args, files)
+        return files
+
+    from classifier import classify_all
+    with metrics.stage("scan"):  # Never the output folder: its files are already sorted
+        if args.scan_workers > 1:
+            from scanner import scan_directory_parallel
+            files = scan_directory_parallel(args.source, workers=args.scan_workers,
+                                            ordered=True, compact=True,
+                                            exclude=_scan_exclude(args))
+        else:
+            from scanner import scan_directory
+            files = scan_directory(args.source, compact=True, exclude=_scan_exclude(args))
+    with metrics.stage("classify"):
+        classify_all(files)
+    if metrics.ENABLED:
+        metrics.add("classify", files=len(files))
+    _sniff(args, files)
+    return files
+
+
+def _sniff(args: argparse.Namespace, files: list[dict]) -> None:
+    if not args.sniff:
+        return
+    from sniffer import ContentSniffer
+    with metrics.stage("sniff"), ContentSniffer(args.output) as sniffer:
+        found = sniffer.refine(files)
+    logger.info(f"Content sniffing placed {found} files ({sniffer.reads} read, {sniffer.hits} cached)")
+
+
+def _scan_only(args: argparse.Namespace) -> int:
+    from collections import Counter
+
+    files = _collect_files(args)
+    if args.duplicates:
+        from dedup import mark_duplicates
+        mark_duplicates(files, "report")
+    print(f"Found {len(files)} files.")
+    for cat, count in Counter(f["category"] for f in files).most_common():
+        print(f"  {cat}: {count} files")
+    dupes = sum(1 for f in files if f.get("duplicate_of"))
+    if dupes:
+        print(f"  ({dupes} duplicates)")
+    return 0
+
+
+def _watch(args: argparse.Namespace) -> int:
+    from organizer import MAX_WORKERS
+    from watcher import Watcher
+
+    move_log = None
+    if "ndjson" in args.formats:
+        from reporter import MoveLogWriter
+        os.makedirs(args.output, exist_ok=True)
+        move_log = MoveLogWriter(args.output, append=True)
+
+    def on_result(result: dict) -> None:
+        print(f"{result['status']:<8} {result['original']} → {result['destination']}", flush=True)
+        if move_log is not None:
+            move_log.write(result)
+
+    watcher = Watcher(args.source, args.output, dry_run=args.dry_run,
+                      use_inotify=False if args.poll else None,
+                      workers=args.workers or MAX_WORKERS, on_result=on_result,
+                      placement=_placement(args),
+                      # Flush per batch so the log can be tailed and survives a kill
+                      on_batch=(lambda _: move_log.flush()) if move_log is not None else None)
+    # A service manager stops us with SIGTERM: finish the batch and close the log
+    signal.signal(signal.SIGTERM, lambda *_: watcher.stop())
+    print(f"Watching {os.path.abspath(args.source)} ({watcher.backend.name}), Ctrl+C to stop")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if move_log is not None:
+            move_log.close()
+    return 0
+
+
+def _replay(args: argparse.Namespace) -> int:
+    """--resume / --undo: work from the journal alone, no scan."""
+    from journal import resume_moves, undo_moves
+    from organizer import MAX_WORKERS
+
+    if args.undo:
+        results = undo_moves(args.output, workers=args.workers or MAX_WORKERS)
+        ok_status, verb = "undone", "restored"
+    else:
+        results = resume_moves(args.output, policy=_execution_policy(args))
+        ok_status, verb = "success", "finished"
+    failed = [r for r in results if r["status"] != ok_status]
+    for r in failed:
+        print(f"{r['status']}: {r['original']}", file=sys.stderr)
+    print(f"{len(results) - len(failed)} of {len(results)} moves {verb}, {len(failed)} errors")
+    return 1 if failed else 0
+
+
+def _organize(args: argparse.Namespace) -> int:
+    from reporter import ReportAccumulator
+
+    acc = ReportAccumulator()
+    keep_results = "html" in args.formats
+    streaming = not (args.index or args.duplicates or args.scan_workers > 1 or args.async_io)
+
+    if streaming:
+        # All stages overlap: moves start while the walk is still running
+        from pipeline import run_organize_pipeline
+        files = None
+    else:
+        from organizer import organize_files
+        from renamer import assign_new_names
+        all_files = files = _collect_files(args)
+        if args.duplicates:
+            from dedup import mark_duplicates
+            action = args.duplicates
+            if args.dry_run and action == "hardlink":
+                action = "skip"  # Same files left to move, but nothing is linked
+            files = mark_duplicates(all_files, action)
+        for f in all_files:
+            acc.add_file(f)
+        with metrics.stage("rename"):
+            assign_new_names(files)
+        if metrics.ENABLED:
+            metrics.add("rename", files=len(files))
+
+    os.makedirs(args.output, exist_ok=True)
+    move_log = None
+    if "ndjson" in args.formats:
+        from reporter import MoveLogWriter
+        move_log = MoveLogWriter(args.output)
+
+    def on_result(result: dict) -> None:
+        acc.add_result(result)
+        if move_log is not None:
+            move_log.write(result)
+
+    journal = None
+    if not (args.dry_run or args.no_journal):
+        from journal import MoveJournal
+        journal = MoveJournal(args.output)
+
+    try:
+        if files is None:
+            sniffer = None
+            if args.sniff:
+                from sniffer import ContentSniffer
+                sniffer = ContentSniffer(args.output)
+            run = run_organize_pipeline(
+                args.source, args.output, dry_run=args.dry_run,
+                policy=_execution_policy(args), on_file=acc.add_file,
+                on_result=on_result, keep_results=keep_results, journal=journal,
+                sniffer=sniffer, placement=_placement(args),
+            )
+            if sniffer is not None:
+                sniffer.save()
+            results = run.results
+            for stage in run.stats:
+                logger.info(f"{stage.name}: {stage.items} items in {stage.busy_seconds:.2f}s "
+                             f"({stage.items_per_second:.0f}/s)")
+        elif args.async_io:
+            import asyncio
+            from async_organizer import ASYNC_CONCURRENCY, organize_files_async
+            results = asyncio.run(organize_files_async(
+                files, args.output, dry_run=args.dry_run,
+                concurrency=args.workers or ASYNC_CONCURRENCY,
+                on_result=on_result, keep_results=keep_results, journal=journal,
+                placement=_placement(args),
+            ))
+        else:
+            results = organize_files(
+                files, args.output, dry_run=args.dry_run,
+                policy=_execution_policy(args),
+                on_result=on_result, keep_results=keep_results, journal=journal,
+                placement=_placement(args),
+            )
+    finally:
+        if move_log is not None:
+            move_log.close()
+        if journal is not None:
+            journal.close()
+
+    with metrics.stage("report"):
+        report = acc.build(args.output)
+        if "html" in args.formats:
+            from reporter import save_html_report
+            save_html_report(report, args.output, results)
+    if metrics.ENABLED:
+        metrics.add("report", files=report["summary"]["total_files"])
+        report["metrics"] = metrics.snapshot()  # Now including the report stage
+    if "json" in args.formats or "json-compact" in args.formats:
+        from reporter import save_json_report
+        save_json_report(report, args.output, compact="json-compact" in args.formats)
+    if args.trace:
+        metrics.dump_trace(args.trace)
+
+    summary = report["summary"]
+    verb = "previewed" if args.dry_run else "organized"
+    done = acc.status_counts.get("dry_run" if args.dry_run else "success", 0)
+    print(f"{done} of {summary['total_files']} files {verb}, "
+          f"{summary['files_failed']} errors → {os.path.abspath(args.output)}")
+    return 1 if summary["files_failed"] else 0
+
+
+def _print_metrics() -> None:
+    snap = metrics.snapshot()
+    for name, s in snap["stages"].items():
+        rate = f"{s['files_per_second']:.0f} files/s" if s["files_per_second"] else "-"
+        print(f"  {name:<9}{s['seconds']:>8.3f}s  {s['files']:>8} files  {rate:>14}  "
+              f"{s['errors']} errors", file=sys.stderr)
+    moves = snap["move_latency"]
+    if moves["count"]:
+        print(f"  moves: mean {moves['mean_ms']} ms, max {moves['max_ms']} ms", file=sys.stderr)
+    print(f"  syscalls: {snap['syscalls']}", file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        stream=sys.stderr,
+    )
+    if args.rules:
+        from classifier import use_rules
+        from rules import RuleSet
+        try:
+            use_rules(RuleSet.load(args.rules, cache_dir=args.output))
+        except (OSError, ValueError) as e:
+            print(f"python -m cli: error: can't load rules from {args.rules}: {e}", file=sys.stderr)
+            return 2
+    if args.metrics or args.trace:
+        metrics.enable(trace=bool(args.trace))
+    with metrics.profile(args.profile):
+        if args.resume or args.undo:
+            code = _replay(args)
+        elif args.watch:
+            code = _watch(args)
+        else:
+            code = _scan_only(args) if args.scan_only else _organize(args)
+    if metrics.ENABLED:
+        _print_metrics()
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
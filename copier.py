@@ -0,0 +1,119 @@
+"""
+copier.py — Cross-device file copy engine with byte-level progress.
+
+Uses the kernel copy paths where available (os.copy_file_range, then
+os.sendfile) and falls back to large chunked reads through a reusable
+per-thread buffer. Progress is reported as byte deltas.
+"""
+
+import errno
+import os
+import shutil
+import stat
+import sys
+import threading
+from typing import Callable
+
+CHUNK_SIZE = 8 * 1024 * 1024  # Bytes per syscall / buffer size
+
+# Errors meaning "this copy method isn't available here", not a real failure
+_UNSUPPORTED = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP,
+                errno.ENOTSUP, errno.EBADF, errno.ETXTBSY}
+
+_local = threading.local()
+
+
+def _buffer() -> memoryview:
+    """One reusable copy buffer per thread."""
+    buf = getattr(_local, "buffer", None)
+    if buf is None:
+        buf = _local.buffer = memoryview(bytearray(CHUNK_SIZE))
+    return buf
+
+
+def _copy_file_range(infd: int, outfd: int, offset: int,
+                     progress: Callable[[int], None] | None) -> int:
+    while True:
+        n = os.copy_file_range(infd, outfd, CHUNK_SIZE)
+        if n == 0:
+            if offset == 0:
+                # Some FUSE / overlay mounts return 0 instead of an error
+                raise OSError(errno.ENOTSUP, "copy_file_range copied nothing")
+            break
+        offset += n
+        if progress:
+            progress(n)
+    return offset
+
+
+def _sendfile(infd: int, outfd: int, offset: int,
+              progress: Callable[[int], None] | None) -> int:
+    while True:
+        n = os.sendfile(outfd, infd, offset, CHUNK_SIZE)
+        if n == 0:
+            if offset == 0:
+                raise OSError(errno.ENOTSUP, "sendfile copied nothing")
+            break
+        offset += n
+        if progress:
+            progress(n)
+    return offset
+
+
+def _chunked(fsrc, outfd: int, offset: int,
+             progress: Callable[[int], None] | None) -> int:
+    buf = _buffer()
+    while True:
+        n = fsrc.readinto(buf)
+        if not n:
+            break
+        view = buf[:n]
+        while view:
+            written = os.write(outfd, view)
+            view = view[written:]
+        offset += n
+        if progress:
+            progress(n)
+    return offset
+
+
+_METHODS = [m for m, available in (
+    (_copy_file_range, hasattr(os, "copy_file_range")),
+    # Elsewhere (e.g. macOS) sendfile only writes to sockets
+    (_sendfile, hasattr(os, "sendfile") and sys.platform.startswith("linux")),
+    (_chunked, True),
+) if available]
+
+
+def copy_file(src: str, dst: str,
+              progress: Callable[[int], None] | None = None) -> int:
+    """
+    Copies src to dst (data + metadata, like shutil.copy2).
+    Calls progress(n) after every chunk of n bytes. Returns bytes copied.
+    Raises OSError if fewer bytes than the source's size were copied, so
+    callers never delete a source whose copy is incomplete, and
+    shutil.SpecialFileError (an OSError) for FIFOs, sockets and devices.
+    """
+    # Opening a FIFO would block forever: refuse anything but regular files first
+    if not stat.S_ISREG(os.stat(src).st_mode):
+        raise shutil.SpecialFileError(f"{src} is not a regular file")
+    # Unbuffered: the kernel methods and lseek() work on the same file positions
+    with open(src, "rb", buffering=0) as fsrc, open(dst, "wb", buffering=0) as fdst:
+        infd, outfd = fsrc.fileno(), fdst.fileno()
+        copied = 0
+        for method in _METHODS:
+            try:
+                copied = method(fsrc if method is _chunked else infd, outfd, copied, progress)
+                break
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED or method is _chunked:
+                    raise
+                # Every method writes at dst's file position, so that is how
+                # far we got; resume there with the next method
+                copied = os.lseek(outfd, 0, os.SEEK_CUR)
+                os.lseek(infd, copied, os.SEEK_SET)
+        expected = os.fstat(infd).st_size
+        if copied != expected:
+            raise OSError(errno.EIO, f"Copied {copied} of {expected} bytes", src)
+    shutil.copystat(src, dst)
+    return copied
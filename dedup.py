@@ -0,0 +1,111 @@
+"""
+dedup.py — Finds byte-identical files before they are organized.
+
+Files are bucketed by size first; only same-size files are hashed, first on
+their head and tail (PARTIAL_BYTES each) and only fully when those match.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("smart_organizer")
+
+PARTIAL_BYTES = 64 * 1024  # Bytes hashed from each end of a candidate
+HASH_WORKERS = 8
+
+DUPLICATE_ACTIONS = ("report", "skip", "hardlink")
+
+
+def _hash_file(path: str, partial: bool) -> str | None:
+    """blake2b of the whole file, or of its first and last PARTIAL_BYTES."""
+    try:
+        with open(path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size == 0:
+                return hashlib.blake2b(b"").hexdigest()
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h = hashlib.blake2b()
+                if partial and size > 2 * PARTIAL_BYTES:
+                    h.update(mm[:PARTIAL_BYTES])
+                    h.update(mm[-PARTIAL_BYTES:])
+                else:
+                    h.update(mm)
+                return h.hexdigest()
+    except (OSError, ValueError):
+        return None  # Unreadable (or vanished) files are never duplicates
+
+
+def _group_by_hash(candidates: list[list[dict]], partial: bool,
+                   executor: ThreadPoolExecutor) -> list[list[dict]]:
+    """Splits each candidate group into groups of files sharing a hash."""
+    flat = [f for group in candidates for f in group]
+    hashes = executor.map(lambda f: _hash_file(f["path"], partial), flat)
+    by_hash: dict[tuple, list[dict]] = defaultdict(list)
+    for f, digest in zip(flat, hashes):
+        if digest is not None:
+            by_hash[(f["size_bytes"], digest)].append(f)
+    return [group for group in by_hash.values() if len(group) > 1]
+
+
+def find_duplicates(files: list[dict], workers: int = HASH_WORKERS) -> list[list[dict]]:
+    """
+    Returns groups of byte-identical files (each group has 2+ files,
+    in input order). Empty files are ignored.
+    """
+    by_size: dict[int, list[dict]] = defaultdict(list)
+    for f in files:
+        if f["size_bytes"] > 0:
+            by_size[f["size_bytes"]].append(f)
+    candidates = [group for group in by_size.values() if len(group) > 1]
+    if not candidates:
+        return []
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        candidates = _group_by_hash(candidates, partial=True, executor=executor)
+        # Files small enough to be fully hashed already are settled
+        settled = [g for g in candidates if g[0]["size_bytes"] <= 2 * PARTIAL_BYTES]
+        large = [g for g in candidates if g[0]["size_bytes"] > 2 * PARTIAL_BYTES]
+        return settled + _group_by_hash(large, partial=False, executor=executor)
+
+
+def _hardlink(original: str, duplicate: str) -> None:
+    """Replaces duplicate with a hard link to original, atomically."""
+    tmp = f"{duplicate}.dedup-tmp"
+    os.link(original, tmp)
+    os.replace(tmp, duplicate)
+
+
+def mark_duplicates(files: list[dict], action: str = "report",
+                    workers: int = HASH_WORKERS) -> list[dict]:
+    """
+    Sets 'duplicate_of' on every file whose content matches an earlier file,
+    then applies action:
+      report    keep everything (duplicates are only counted in the report)
+      skip      leave duplicates where they are
+      hardlink  replace each duplicate with a hard link to its original
+                (sets 'hardlinked' on each one that succeeded)
+    Returns the files that should still be organized.
+    """
+    if action not in DUPLICATE_ACTIONS:
+        raise ValueError(f"Unknown duplicate action: {action}")
+
+    duplicates = set()
+    for group in find_duplicates(files, workers):
+        original = group[0]
+        for f in group[1:]:
+            f["duplicate_of"] = original["path"]
+            duplicates.add(id(f))
+            if action == "hardlink":
+                try:
+                    _hardlink(original["path"], f["path"])
+                    f["hardlinked"] = True  # Its bytes are freed: counted in the report
+                except OSError as e:
+                    logger.warning(f"Could not hardlink {f['path']}: {e}")
+
+    if action == "report":
+        return files
+    return [f for f in files if id(f) not in duplicates]
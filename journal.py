@@ -0,0 +1,348 @@
+"""
+journal.py — Crash-safe record of planned and completed moves.
+
+Every move is written to organizer_journal.ndjson in the output folder
+before it starts ("plan") and after it finishes ("done"). Plans are made
+durable in groups: a group of GROUP_SIZE planned moves is written with one
+fsync, and only then are those moves started. "done" lines are fsynced per
+group too; losing some of them in a crash only means resume checks those
+files again.
+
+    with MoveJournal(out) as journal:
+        organize_files(files, out, journal=journal)
+    resume_moves(out)   # finish what a crashed run planned
+    undo_moves(out)     # put every journaled file back where it came from
+"""
+
+import errno
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator
+
+from copier import CHUNK_SIZE
+from organizer import MAX_WORKERS, ExecutionPolicy, _DestinationFolder, _relocate, _run_moves
+
+logger = logging.getLogger("smart_organizer")
+
+JOURNAL_FILENAME = "organizer_journal.ndjson"
+GROUP_SIZE = 256       # Records per fsync
+GROUP_SECONDS = 0.05   # ...or sooner, so a slow stream doesn't hold moves back
+
+_END = object()
+
+
+# One shared encoder: json.dumps() with options builds a new one per call
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _dumps(record: dict) -> bytes:
+    return _ENCODER.encode(record).encode("utf-8")
+
+
+class MoveJournal:
+    """
+    Append-only writer, safe to share between threads. plan() wraps the
+    planner's (file, dest, same_device) stream; record(result) logs a
+    finished move.
+    """
+
+    def __init__(self, output_dir: str):
+        os.makedirs(output_dir, exist_ok=True)
+        self.path = os.path.join(output_dir, JOURNAL_FILENAME)
+        self._next_id = 0
+        torn = False
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as fh:
+                for line in fh:
+                    if line.startswith(b'{"op":"plan"'):
+                        self._next_id += 1
+                    torn = not line.endswith(b"\n")
+        self._fh = open(self.path, "ab")
+        if torn:
+            self._fh.write(b"\n")  # Leave a crash's half line on its own
+        self._ids: dict[str, int] = {}
+        self._unsynced = 0
+        self._lock = threading.Lock()
+
+    def _sync(self) -> None:
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._unsynced = 0
+
+    def plan(self, moves: Iterable[tuple[dict, str, bool]]) -> Iterator[tuple[dict, str, bool]]:
+        """
+        Journals planned moves and yields each one only once it is on disk.
+        moves is read on a helper thread, so a partial group is flushed
+        GROUP_SECONDS after its first move even while the stream stalls.
+        """
+        ahead: queue.Queue = queue.Queue(maxsize=GROUP_SIZE)
+        stop = threading.Event()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    ahead.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def feed() -> None:
+            try:
+                for move in moves:
+                    if not put(move):
+                        return  # The consumer stopped early
+                put(_END)
+            except BaseException as e:
+                put(e)
+
+        threading.Thread(target=feed, daemon=True).start()
+        group: list[tuple[dict, str, bool]] = []
+        due = 0.0
+        try:
+            while True:
+                if group:
+                    try:
+                        item = ahead.get(timeout=max(due - time.monotonic(), 0))
+                    except queue.Empty:
+                        item = None  # The group's time is up
+                else:
+                    item = ahead.get()
+                if item is _END:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                if item is not None:
+                    f, dest_path, same_device = item
+                    with self._lock:
+                        move_id = self._next_id
+                        self._next_id += 1
+                        self._ids[f["path"]] = move_id
+                        self._fh.write(_dumps({
+                            # Absolute, so --resume / --undo work from any cwd
+                            "op": "plan", "id": move_id, "src": os.path.abspath(f["path"]),
+                            "dst": os.path.abspath(dest_path),
+                            "same_device": same_device,
+                            "category": f.get("category", "Miscellaneous"),
+                            "size_bytes": f["size_bytes"],
+                        }) + b"\n")
+                    if not group:
+                        due = time.monotonic() + GROUP_SECONDS
+                    group.append(item)
+                    if len(group) < GROUP_SIZE and time.monotonic() < due:
+                        continue
+                with self._lock:
+                    self._sync()
+                yield from group
+                group = []
+            if group:
+                with self._lock:
+                    self._sync()
+                yield from group
+        finally:
+            stop.set()
+
+    def record(self, result: dict, move_id: int | None = None, op: str = "done") -> None:
+        """Logs a finished move (op="undo" for results of undo_moves)."""
+        with self._lock:
+            if move_id is None:
+                move_id = self._ids.pop(result["original"], None)
+                if move_id is None:
+                    return
+            self._fh.write(_dumps({"op": op, "id": move_id, "status": result["status"]}) + b"\n")
+            self._unsynced += 1
+            if self._unsynced >= GROUP_SIZE:
+                self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._fh.closed:
+                self._sync()
+                self._fh.close()
+
+    def __enter__(self) -> "MoveJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_journal(output_dir: str) -> tuple[dict[int, dict], dict[int, str], set[int]]:
+    """Returns (plans by id, final status by id, undone ids). Skips torn lines."""
+    plans: dict[int, dict] = {}
+    done: dict[int, str] = {}
+    undone: set[int] = set()
+    path = os.path.join(output_dir, JOURNAL_FILENAME)
+    if not os.path.exists(path):
+        return plans, done, undone
+    with open(path, "rb") as fh:
+        for line in fh:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            op = record.get("op")
+            if op == "plan":
+                plans[record["id"]] = record
+            elif op == "done":
+                done[record["id"]] = record["status"]
+            elif op == "undo" and record["status"] == "undone":
+                undone.add(record["id"])
+    return plans, done, undone
+
+
+def _file_from_plan(plan: dict) -> dict:
+    return {
+        "name": os.path.basename(plan["src"]), "path": plan["src"],
+        "category": plan["category"], "size_bytes": plan["size_bytes"],
+    }
+
+
+def _partial_copy(dst: str, src: str) -> bool:
+    """True if dst holds the start of src's bytes, as an interrupted copy leaves it."""
+    try:
+        if not os.path.isfile(dst) or os.path.islink(dst):
+            return False
+        if os.path.getsize(dst) > os.path.getsize(src):
+            return False
+        with open(dst, "rb") as copied, open(src, "rb") as original:
+            while True:
+                chunk = copied.read(CHUNK_SIZE)
+                if not chunk:
+                    return True
+                if original.read(len(chunk)) != chunk:
+                    return False
+    except OSError:
+        return False
+
+
+def resume_moves(output_dir: str, policy: ExecutionPolicy | None = None,
+                 on_result: Callable[[dict], None] | None = None) -> list[dict]:
+    """
+    Finishes moves that were planned but have no "done" line. Entries with
+    one are skipped without touching the file system; the rest are checked:
+    source still there → move again, only destination there → it had
+    finished, neither → reported as missing.
+    A destination that is taken is never overwritten, except by the same
+    cross-device move whose partial copy it is. Otherwise the file gets a
+    fresh name in that folder, journaled as a new plan.
+    """
+    plans, done, _ = read_journal(output_dir)
+    pending = [plans[i] for i in sorted(plans) if i not in done]
+    results: list[dict] = []
+    lock = threading.Lock()
+
+    with MoveJournal(output_dir) as journal:
+        def collect(result: dict, move_id: int | None = None) -> None:
+            with lock:
+                journal.record(result, move_id)  # None: a re-planned move, known to journal
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+
+        moves = []
+        replanned = []
+        folders: dict[str, _DestinationFolder] = {}
+        ids: dict[str, int] = {}
+        for plan in pending:
+            f = _file_from_plan(plan)
+            if os.path.lexists(plan["src"]):
+                dst = plan["dst"]
+                if (not os.path.lexists(dst)
+                        or not plan["same_device"] and _partial_copy(dst, plan["src"])):
+                    ids[plan["src"]] = plan["id"]
+                    moves.append((f, dst, plan["same_device"]))
+                    continue
+                # Something else took the path since the crash: pick a new name
+                directory = os.path.dirname(dst)
+                if directory not in folders:
+                    folders[directory] = _DestinationFolder(directory)
+                    # Names other pending moves will still take
+                    folders[directory].names.update(
+                        os.path.basename(p["dst"]) for p in pending
+                        if os.path.dirname(p["dst"]) == directory
+                    )
+                new_dst = folders[directory].reserve(os.path.basename(dst))
+                replanned.append((plan, (f, new_dst, plan["same_device"])))
+                continue
+            status = "success" if os.path.lexists(plan["dst"]) else "error: source missing"
+            collect({"original": plan["src"], "destination": plan["dst"],
+                     "category": plan["category"], "size_bytes": plan["size_bytes"],
+                     "status": status}, plan["id"])
+
+        if replanned:
+            # New plans are on disk before the old ones are closed
+            moves += journal.plan([move for _, move in replanned])
+            for plan, (_, new_dst, _) in replanned:
+                logger.warning(f"{plan['dst']} is taken; resuming to {new_dst}")
+                journal.record({"status": "replanned"}, plan["id"])
+
+        logger.info(f"Resuming {len(moves)} of {len(pending)} unfinished moves")
+        _run_moves(moves, policy or ExecutionPolicy(), None, None,
+                   lambda result: collect(result, ids.get(result["original"])))
+    return results
+
+
+def _restore(dst: str, src: str) -> None:
+    """Moves dst back to src, never overwriting something now at src."""
+    os.makedirs(os.path.dirname(src), exist_ok=True)
+    if os.path.lexists(src):
+        raise FileExistsError(errno.EEXIST, "Original path is taken", src)
+    _relocate(dst, src, same_device=True)  # Falls back to a copy across devices
+
+
+def undo_moves(output_dir: str, workers: int = MAX_WORKERS,
+               on_result: Callable[[dict], None] | None = None) -> list[dict]:
+    """
+    Puts every successfully journaled, not yet undone file back at its
+    original path, newest first. Moves run in parallel in waves: a move is
+    only undone after any later move that reused its path.
+    Empty category folders left behind are removed.
+    """
+    plans, done, undone = read_journal(output_dir)
+    entries = [plans[i] for i in sorted(plans) if done.get(i) == "success" and i not in undone]
+
+    # A path freed by undoing a later move may be the target of an earlier one
+    waves: list[list[dict]] = []
+    ready_at: dict[str, int] = {}
+    for plan in reversed(entries):
+        wave = ready_at.get(plan["dst"], 0)
+        ready_at[plan["src"]] = max(ready_at.get(plan["src"], 0), wave + 1)
+        while len(waves) <= wave:
+            waves.append([])
+        waves[wave].append(plan)
+
+    results: list[dict] = []
+    lock = threading.Lock()
+
+    def undo(plan: dict) -> dict:
+        result = {"original": plan["dst"], "destination": plan["src"],
+                  "category": plan["category"], "size_bytes": plan["size_bytes"]}
+        try:
+            _restore(plan["dst"], plan["src"])
+            result["status"] = "undone"
+        except Exception as e:
+            result["status"] = f"error: {e}"
+            logger.error(f"Failed to restore {plan['dst']}: {e}")
+        return result
+
+    with MoveJournal(output_dir) as journal, ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        for wave in waves:
+            for plan, result in zip(wave, pool.map(undo, wave)):
+                with lock:
+                    journal.record(result, plan["id"], op="undo")
+                    results.append(result)
+                    if on_result is not None:
+                        on_result(result)
+
+    for folder in {os.path.dirname(plan["dst"]) for plan in entries}:
+        try:
+            os.rmdir(folder)
+        except OSError:
+            pass  # Not empty (or already gone)
+    return results
@@ -2,16 +2,22 @@
 import os
 import json
 import threading
+from contextlib import nullcontext
 import logging
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from datetime import datetime
 
-from scanner import scan_directory, human_readable_size
-from classifier import classify_all
+from scanner import human_readable_size
+from scan_index import ScanIndex
 from renamer import assign_new_names
 from organizer import organize_files
-from reporter import build_report, save_json_report, save_html_report
+from dedup import mark_duplicates
+from reporter import build_report, save_json_report, save_html_report, MoveLogWriter
+from ui_events import UIEventBus
+from pipeline import run_organize_pipeline
+from watcher import Watcher
+from journal import MoveJournal
 
 
 LOG_DIR = os.path.join(os.path.dirname(__file__), "logs")
@@ -39,6 +45,8 @@ SUCCESS  = "#00e676"
 DANGER   = "#ff5252"
 WARNING  = "#ff9100"
 
+MAX_LOG_LINES = 5000  # Oldest activity-log lines are dropped past this
+
 class SmartOrganizerApp(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -53,11 +61,16 @@ class SmartOrganizerApp(tk.Tk):
             value=os.path.join(os.path.dirname(__file__), "organized")
         )
         self.dry_run = tk.BooleanVar(value=False)
+        self.skip_duplicates = tk.BooleanVar(value=False)
         self.status_var = tk.StringVar(value="Ready.")
         self.files_data = []
         self.results_data = []
+        self.watcher = None
+        self.watch_stop = None
 
         self._build_ui()
+        self.bus = UIEventBus(self, self._append_log, self._set_progress, self.status_var.set)
+        self.bus.start()
 #ui
     def _build_ui(self):
         self._build_header()
@@ -133,6 +146,15 @@ class SmartOrganizerApp(tk.Tk):
         )
         dry_cb.pack(side="left")
 
+        dup_cb = tk.Checkbutton(
+            f, text="Skip duplicates (leave identical copies in place)",
+            variable=self.skip_duplicates,
+            bg=BG, fg=MUTED, selectcolor=CARD,
+            activebackground=BG, activeforeground=TEXT,
+            font=("Helvetica", 10),
+        )
+        dup_cb.pack(side="left", padx=(16, 0))
+
     def _build_log_area(self):
         lf = self._card(self)
         lf.pack(fill="both", expand=True, padx=24, pady=(0, 12))
@@ -190,6 +212,9 @@ class SmartOrganizerApp(tk.Tk):
         self.org_btn = self._btn(bf, "  Scan & Organize", self._run_organize, ACCENT)
         self.org_btn.pack(side="left", padx=(12, 0))
 
+        self.watch_btn = self._btn(bf, "👁  Watch", self._toggle_watch, "#444", small=True)
+        self.watch_btn.pack(side="left", padx=(12, 0))
+
         self.report_btn = self._btn(bf, "📊  Open Report", self._open_report, "#444", small=True)
         self.report_btn.pack(side="right")
         self.report_btn.config(state="disabled")
@@ -237,12 +262,23 @@ class SmartOrganizerApp(tk.Tk):
 
     # ── Logging to UI ─────────────────────────────────
     def _log(self, msg: str, tag="info"):
+        """Safe from any thread: lines reach the widget via the event bus."""
         ts = datetime.now().strftime("%H:%M:%S")
+        self.bus.log(f"[{ts}] {msg}\n", tag)
+
+    def _append_log(self, lines: list[tuple[str, str]]):
         self.log_box.config(state="normal")
-        self.log_box.insert("end", f"[{ts}] {msg}\n", tag)
+        # One insert for the whole batch: text1, tag1, text2, tag2, …
+        self.log_box.insert("end", *(part for line in lines for part in line))
+        excess = int(self.log_box.index("end-1c").split(".")[0]) - MAX_LOG_LINES
+        if excess > 0:
+            self.log_box.delete("1.0", f"{excess + 1}.0")
         self.log_box.see("end")
         self.log_box.config(state="disabled")
 
+    def _set_progress(self, value: float):
+        self.progress["value"] = value
+
     def _clear_log(self):
         self.log_box.config(state="normal")
         self.log_box.delete("1.0", "end")
@@ -270,34 +306,60 @@ class SmartOrganizerApp(tk.Tk):
         return True
 
     def _set_buttons(self, enabled: bool):
-        state = "normal" if enabled else "disabled"
+        # Scan/Organize and Watch move the same files: only one runs at a time
+        state = "normal" if enabled and self.watch_stop is None else "disabled"
         self.scan_btn.config(state=state)
         self.org_btn.config(state=state)
+        if self.watch_stop is None:  # While watching, the button is Stop Watching
+            self.watch_btn.config(state="normal" if enabled else "disabled")
 
     def _scan_only(self):
         if not self._validate_paths():
             return
-        threading.Thread(target=self._do_scan, daemon=True).start()
+        self._set_buttons(False)
+        args = (self.source_path.get(), self.output_path.get())
+        threading.Thread(target=self._do_scan, args=args, daemon=True).start()
 
     def _run_organize(self):
         if not self._validate_paths():
             return
-        threading.Thread(target=self._do_organize, daemon=True).start()
-
-    def _do_scan(self):
         self._set_buttons(False)
-        self.progress["value"] = 0
-        self.status_var.set("Scanning…")
-        src = self.source_path.get()
+        args = (
+            self.source_path.get(), self.output_path.get(),
+            self.dry_run.get(), self.skip_duplicates.get(),
+        )
+        threading.Thread(target=self._do_organize, args=args, daemon=True).start()
+
+    def _toggle_watch(self):
+        if self.watch_stop is not None:
+            # The watcher may still be setting up: _do_watch checks the event too
+            self.watch_stop.set()
+            if self.watcher is not None:
+                self.watcher.stop()
+            self.watch_btn.config(state="disabled")
+            return
+        if not self._validate_paths():
+            return
+        self._set_buttons(False)
+        self.watch_stop = threading.Event()
+        self.watch_btn.config(text="⏹  Stop Watching", state="normal")
+        args = (self.source_path.get(), self.output_path.get(), self.dry_run.get())
+        threading.Thread(target=self._do_watch, args=args, daemon=True).start()
+
+    # The _do_* methods run on worker threads: they only touch the UI
+    # through self._log and self.bus.
+    def _do_scan(self, src: str, out: str):
+        self.bus.progress(0)
+        self.bus.status("Scanning…")
 
         try:
             self._log(f"Scanning: {src}", "accent")
-            files = scan_directory(src)
-            classify_all(files)
+            with ScanIndex(out) as index:
+                files = index.scan(src, compact=True, exclude=[out])
             assign_new_names(files)
             self.files_data = files
 
-            self.progress["value"] = 100
+            self.bus.progress(100)
             self._log(f"Found {len(files)} files.", "success")
 
             # Category summary
@@ -306,66 +368,165 @@ class SmartOrganizerApp(tk.Tk):
             for cat, count in sorted(cats.items(), key=lambda x: -x[1]):
                 self._log(f"  {cat}: {count} files")
 
-            self.status_var.set(f"Scan complete — {len(files)} files found.")
+            self.bus.status(f"Scan complete — {len(files)} files found.")
 
         except Exception as e:
             self._log(f"Error: {e}", "error")
-            self.status_var.set("Error during scan.")
+            self.bus.status("Error during scan.")
         finally:
-            self._set_buttons(True)
+            self.bus.call(self._set_buttons, True)
 
-    def _do_organize(self):
-        self._set_buttons(False)
-        self.progress["value"] = 0
-        src = self.source_path.get()
-        out = self.output_path.get()
-        dry = self.dry_run.get()
+    def _do_organize(self, src: str, out: str, dry: bool, skip_dupes: bool):
+        self.bus.progress(0)
 
         try:
-            # Step 1: Scan
+            # Step 1 + 2: Scan and organize
             self._log(f"{'[DRY RUN] ' if dry else ''}Scanning: {src}", "accent")
-            self.status_var.set("Scanning…")
-            files = scan_directory(src)
-            classify_all(files)
-            assign_new_names(files)
+            self.bus.status("Scanning…")
+            total = None
+            done = 0
+
+            # Journal real runs so a crash can be resumed or undone (python -m cli --resume/--undo)
+            with MoveLogWriter(out) as move_log, \
+                    (nullcontext() if dry else MoveJournal(out)) as journal:
+                def on_result(result: dict):
+                    nonlocal done  # organize_files calls this one at a time
+                    done += 1
+                    move_log.write(result)
+                    self.bus.status(f"Organizing… {done}/{total or '?'}")
+
+                if skip_dupes:
+                    # Duplicate detection needs every file before anything moves
+                    with ScanIndex(out) as index:
+                        files = index.scan(src, compact=True, exclude=[out])
+                    assign_new_names(files)
+                    self._log(f"Found {len(files)} files across {len(set(f['category'] for f in files))} categories.", "success")
+                    self.bus.progress(33)
+
+                    self.bus.status("Checking for duplicates…")
+                    to_move = mark_duplicates(files, "skip")
+                    self._log(f"  {len(files) - len(to_move)} duplicates will be skipped.", "warn")
+
+                    self.bus.status("Organizing…")
+                    self._log("Moving files…", "accent")
+                    total = len(to_move)
+                    results = organize_files(
+                        to_move, out, dry_run=dry,
+                        progress=self._byte_progress(to_move, start=33, span=33),
+                        on_result=on_result, journal=journal,
+                    )
+                else:
+                    # Stages overlap: files move while the scan is still running
+                    self._log("Moving files as they are found…", "accent")
+                    files = []
+                    found_bytes = 0
+
+                    def on_file(f: dict):
+                        nonlocal found_bytes  # Only the rename stage calls this
+                        files.append(f)
+                        found_bytes += f["size_bytes"]
+
+                    run = run_organize_pipeline(
+                        src, out, dry_run=dry, on_file=on_file, on_result=on_result,
+                        journal=journal,
+                        progress=self._byte_progress(files, start=0, span=66,
+                                                     total=lambda: found_bytes),
+                    )
+                    results = run.results
+                    self._log(f"Found {len(files)} files across {len(set(f['category'] for f in files))} categories.", "success")
+                    for stage in run.stats:
+                        self._log(f"  {stage.name}: {stage.items} in {stage.busy_seconds:.2f}s")
             self.files_data = files
-            self._log(f"Found {len(files)} files across {len(set(f['category'] for f in files))} categories.", "success")
-            self.progress["value"] = 33
-
-            # Step 2: Organize
-            self.status_var.set("Organizing…")
-            self._log("Moving files…", "accent")
-            results = organize_files(files, out, dry_run=dry)
             self.results_data = results
 
             ok = sum(1 for r in results if r["status"] in ("success", "dry_run"))
             err = sum(1 for r in results if str(r["status"]).startswith("error"))
             self._log(f"  ✓ {ok} files {'previewed' if dry else 'moved'}  ✗ {err} errors",
                       "success" if err == 0 else "warn")
-            self.progress["value"] = 66
+            self.bus.progress(66)
 
             # Step 3: Report
-            self.status_var.set("Generating report…")
+            self.bus.status("Generating report…")
             report = build_report(files, results, out)
             os.makedirs(out, exist_ok=True)
             json_path = save_json_report(report, out)
-            html_path = save_html_report(report, out)
+            html_path = save_html_report(report, out, results)
             self._log(f"Report saved → {html_path}", "success")
-            self.progress["value"] = 100
+            self.bus.progress(100)
 
-            self.report_btn.config(state="normal", command=lambda p=html_path: self._open_html(p))
-            self.status_var.set(
+            self.bus.call(self.report_btn.config, state="normal",
+                          command=lambda p=html_path: self._open_html(p))
+            self.bus.status(
                 f"Done! {ok} files {'previewed' if dry else 'organized'}. Report ready."
             )
             if not dry:
-                messagebox.showinfo("Complete", f"Organized {ok} files!\nReport: {html_path}")
+                self.bus.call(messagebox.showinfo, "Complete",
+                              f"Organized {ok} files!\nReport: {html_path}")
 
         except Exception as e:
             self._log(f"Error: {e}", "error")
-            self.status_var.set("Error during organization.")
+            self.bus.status("Error during organization.")
             logger.exception("Organize error")
         finally:
-            self._set_buttons(True)
+            self.bus.call(self._set_buttons, True)
+
+    def _do_watch(self, src: str, out: str, dry: bool):
+        try:
+            with MoveLogWriter(out, append=True) as move_log:
+                def on_result(result: dict):
+                    move_log.write(result)
+                    name = os.path.basename(result["destination"])
+                    if result["status"] in ("success", "dry_run"):
+                        self._log(f"  {os.path.basename(result['original'])} → {result['category']}/{name}", "success")
+                    else:
+                        self._log(f"  {result['original']}: {result['status']}", "error")
+
+                self.watcher = Watcher(src, out, dry_run=dry, on_result=on_result,
+                                       on_batch=lambda _: move_log.flush())
+                if self.watch_stop.is_set():
+                    self.watcher.stop()
+                self._log(f"Watching {src} for new files ({self.watcher.backend.name})…", "accent")
+                self.bus.status("Watching for new files…")
+                self.watcher.run()
+            self._log("Stopped watching.", "accent")
+            self.bus.status("Ready.")
+        except Exception as e:
+            self._log(f"Error: {e}", "error")
+            self.bus.status("Error while watching.")
+            logger.exception("Watch error")
+        finally:
+            self.watcher = None
+            self.bus.call(self._reset_watch)
+
+    def _reset_watch(self):
+        self.watch_stop = None
+        self.watch_btn.config(text="👁  Watch", state="normal")
+        self._set_buttons(True)
+
+    def _byte_progress(self, files, start: float, span: float, total=None):
+        """
+        Returns a progress(n_bytes) callback that moves the bar start→start+span.
+        total() gives the bytes found so far when files is still being scanned;
+        the bar never moves back as it grows.
+        """
+        if total is None:
+            fixed = sum(f["size_bytes"] for f in files)
+            total = lambda: fixed  # noqa: E731
+        done = 0
+        shown = int(start)
+        lock = threading.Lock()
+
+        def progress(n: int):
+            nonlocal done, shown
+            with lock:
+                done += n
+                value = int(start + span * min(done / max(total(), 1), 1))
+                if value <= shown:
+                    return
+                shown = value
+            self.bus.progress(value)
+
+        return progress
 
     def _open_report(self):
         pass  # Replaced dynamically after run
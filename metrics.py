@@ -0,0 +1,175 @@
+"""
+metrics.py — Optional per-stage instrumentation.
+
+Off by default. Call sites guard every hook with `if metrics.ENABLED:`, so
+a disabled run pays one global lookup per hook and nothing else.
+
+    import metrics
+    metrics.enable(trace=True)
+    with metrics.stage("scan"):
+        files = scan_directory(src)
+    metrics.add("scan", files=len(files))
+    metrics.snapshot()                       # → dict, also added to the report
+    metrics.dump_trace("trace.json")         # chrome://tracing / Perfetto
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Iterator
+
+ENABLED = False
+
+_lock = threading.Lock()
+_trace_enabled = False
+_epoch = time.perf_counter()
+_stages: dict[str, dict] = {}
+_syscalls: dict[str, int] = defaultdict(int)
+_move_buckets: dict[int, int] = defaultdict(int)  # log2(µs) → count
+_move_count = 0
+_move_total = 0.0
+_move_max = 0.0
+_events: list[dict] = []
+
+
+def _new_stage() -> dict:
+    return {"seconds": 0.0, "files": 0, "bytes": 0, "errors": 0}
+
+
+def enable(trace: bool = False) -> None:
+    """Turns instrumentation on (and resets it). trace=True also keeps
+    per-move spans for dump_trace()."""
+    global ENABLED, _trace_enabled
+    reset()
+    _trace_enabled = trace
+    ENABLED = True
+
+
+def disable() -> None:
+    global ENABLED
+    ENABLED = False
+
+
+def reset() -> None:
+    global _move_count, _move_total, _move_max, _epoch
+    with _lock:
+        _stages.clear()
+        _syscalls.clear()
+        _move_buckets.clear()
+        _events.clear()
+        _move_count = 0
+        _move_total = 0.0
+        _move_max = 0.0
+        _epoch = time.perf_counter()
+
+
+def _span(name: str, start: float, duration: float, category: str) -> None:
+    _events.append({
+        "name": name, "cat": category, "ph": "X", "pid": os.getpid(),
+        "tid": threading.get_ident(),
+        "ts": round((start - _epoch) * 1e6, 1), "dur": round(duration * 1e6, 1),
+    })
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Adds the wall time of the block to the named stage."""
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _lock:
+            _stages.setdefault(name, _new_stage())["seconds"] += elapsed
+            _span(name, start, elapsed, "stage")
+
+
+def add(name: str, files: int = 0, bytes: int = 0, errors: int = 0,
+        seconds: float = 0.0) -> None:
+    """Adds counts (and optionally time measured elsewhere) to a stage."""
+    with _lock:
+        s = _stages.setdefault(name, _new_stage())
+        s["files"] += files
+        s["bytes"] += bytes
+        s["errors"] += errors
+        s["seconds"] += seconds
+
+
+def syscall(name: str, n: int = 1) -> None:
+    with _lock:
+        _syscalls[name] += n
+
+
+def observe_move(start: float, seconds: float, size: int, ok: bool) -> None:
+    """Records one move: latency histogram plus the 'move' stage counters."""
+    global _move_count, _move_total, _move_max
+    with _lock:
+        _move_buckets[int(seconds * 1e6).bit_length()] += 1
+        _move_count += 1
+        _move_total += seconds
+        _move_max = max(_move_max, seconds)
+        s = _stages.setdefault("move", _new_stage())
+        s["files"] += 1
+        s["bytes"] += size if ok else 0
+        s["errors"] += 0 if ok else 1
+        if _trace_enabled:
+            _span("move", start, seconds, "move")
+
+
+def snapshot() -> dict:
+    """All metrics so far as a JSON-ready dict."""
+    with _lock:
+        stages = {}
+        for name, s in _stages.items():
+            secs = s["seconds"]
+            stages[name] = dict(
+                s,
+                seconds=round(secs, 6),
+                files_per_second=round(s["files"] / secs, 1) if secs else None,
+                bytes_per_second=round(s["bytes"] / secs, 1) if secs else None,
+            )
+        histogram = {
+            f"<{1 << bucket}us": count for bucket, count in sorted(_move_buckets.items())
+        }
+        return {
+            "stages": stages,
+            "syscalls": dict(_syscalls),
+            "move_latency": {
+                "count": _move_count,
+                "mean_ms": round(_move_total / _move_count * 1e3, 3) if _move_count else None,
+                "max_ms": round(_move_max * 1e3, 3),
+                "histogram": histogram,
+            },
+        }
+
+
+def dump_trace(path: str) -> str:
+    """Writes recorded spans in Chrome trace-event JSON format."""
+    with _lock:
+        events = list(_events)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fh)
+    return path
+
+
+@contextmanager
+def profile(path: str | None) -> Iterator[None]:
+    """Runs the block under cProfile and dumps stats to path (if given)."""
+    if not path:
+        yield
+        return
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
@@ -2,46 +2,262 @@
 organizer.py — Moves files into categorized subfolders inside the output directory.
 """
 
+import errno
 import os
-import shutil
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import metrics
+from copier import copy_file
 
 logger = logging.getLogger("smart_organizer")
 
 MAX_WORKERS = 8  # Move up to 8 files simultaneously
 
 
-def _move_single(f: dict, output_dir: str) -> dict:
-    """Moves a single file. Called in parallel."""
-    category = f.get("category", "Miscellaneous")
-    new_name = f.get("new_name", f["name"])
-    dest_folder = os.path.join(output_dir, category)
-    dest_path = os.path.join(dest_folder, new_name)
+@dataclass
+class ExecutionPolicy:
+    """
+    How organize_files runs its moves.
+      threads         moves in flight at once (the starting point if adaptive)
+      copy_processes  if > 0, cross-device copies run in a process pool
+      adaptive        re-measure files/sec every probe_moves moves and grow
+                      or shrink the in-flight count between min/max_threads
+    """
+    threads: int = MAX_WORKERS
+    copy_processes: int = 0
+    adaptive: bool = False
+    probe_moves: int = 64
+    min_threads: int = 1
+    max_threads: int = 256
+
+    @classmethod
+    def for_storage(cls, kind: str) -> "ExecutionPolicy":
+        """Presets: 'ssd', 'hdd' or 'network' (SMB / NFS)."""
+        presets = {
+            "ssd": cls(threads=16, max_threads=64),
+            # Extra threads only make a spinning disk seek more
+            "hdd": cls(threads=2, max_threads=4),
+            # Round-trip bound: keep many requests in flight and let it tune
+            "network": cls(threads=64, adaptive=True, max_threads=512),
+        }
+        if kind not in presets:
+            raise ValueError(f"Unknown storage type: {kind}")
+        return presets[kind]
+
+
+class _ConcurrencyLimit:
+    """A semaphore whose size can change while moves are running."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    def resize(self, limit: int) -> None:
+        with self._cond:
+            self.limit = limit
+            self._cond.notify_all()
+
+
+class _AdaptiveTuner:
+    """
+    Hill-climbs the in-flight limit on measured throughput: after each
+    window of probe_moves moves, keep going in the same direction (x2 or /2)
+    until files/sec drops noticeably, then turn around.
+    """
+
+    def __init__(self, policy: ExecutionPolicy, limit: _ConcurrencyLimit):
+        self.policy = policy
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._count = 0
+        self._window_start = time.perf_counter()
+        self._last_rate = 0.0
+        self._growing = True
+
+    def record(self) -> None:
+        with self._lock:
+            self._count += 1
+            if self._count < self.policy.probe_moves:
+                return
+            now = time.perf_counter()
+            rate = self._count / max(now - self._window_start, 1e-9)
+            self._count = 0
+            self._window_start = now
+
+            if rate < self._last_rate * 0.9:  # Ignore jitter under 10%
+                self._growing = not self._growing
+            self._last_rate = rate
+
+            current = self.limit.limit
+            if self._growing:
+                new = min(current * 2, self.policy.max_threads)
+            else:
+                new = max(current // 2, self.policy.min_threads)
+            if new != current:
+                logger.debug(f"Adaptive pool: {current} → {new} threads ({rate:.0f} files/s)")
+                self.limit.resize(new)
+
+
+class _DestinationFolder:
+    """One category folder: created once and listed once."""
+
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            os.makedirs(path, exist_ok=True)
+            self.dev = os.stat(path).st_dev
+            self.names = set(os.listdir(path))
+        except OSError:
+            # Leave it to the move itself to surface the error per file
+            self.dev = None
+            self.names = set()
+        if metrics.ENABLED:
+            metrics.syscall("makedirs")
+            metrics.syscall("stat")
+            metrics.syscall("listdir")
+        self._next_suffix: dict[str, int] = {}
+
+    def reserve(self, name: str) -> str:
+        """Claims a free file name in this folder (name, name_1, name_2, …)."""
+        if name in self.names:
+            base, ext = os.path.splitext(name)
+            i = self._next_suffix.get(name, 1)
+            while f"{base}_{i}{ext}" in self.names:
+                i += 1
+            self._next_suffix[name] = i + 1
+            name = f"{base}_{i}{ext}"
+        self.names.add(name)
+        return os.path.join(self.path, name)
+
+
+class _MovePlanner:
+    """
+    Resolves destinations before anything moves. Each destination folder is
+    created and listed once; collisions with existing files and with other
+    planned files are settled in memory. Also caches st_dev per source
+    directory to pick rename vs copy.
+    placement (a placement.PlacementPolicy) picks the folder for each file;
+    without one it is output_dir/Category. With dry_run=True only
+    directory() is used and nothing is created.
+    """
+
+    def __init__(self, output_dir: str, placement=None, dry_run: bool = False):
+        self.output_dir = output_dir
+        self.placement = placement
+        self._names = None if dry_run else lambda path: self._folder(path).names
+        self._folders: dict[str, _DestinationFolder] = {}
+        self._source_devs: dict[str, int | None] = {}
+
+    def directory(self, f: dict) -> str:
+        if self.placement is not None:
+            # Shard counts start from the listing the planner needs anyway
+            return self.placement.directory(f, self.output_dir, self._names)
+        return os.path.join(self.output_dir, f.get("category", "Miscellaneous"))
+
+    def _folder(self, path: str) -> _DestinationFolder:
+        folder = self._folders.get(path)
+        if folder is None:
+            folder = _DestinationFolder(path)
+            self._folders[path] = folder
+        return folder
+
+    def _source_dev(self, path: str) -> int | None:
+        directory = os.path.dirname(path)
+        if directory not in self._source_devs:
+            try:
+                self._source_devs[directory] = os.stat(directory).st_dev
+            except OSError:
+                self._source_devs[directory] = None
+            if metrics.ENABLED:
+                metrics.syscall("stat")
+        return self._source_devs[directory]
+
+    def plan(self, f: dict) -> tuple[str, bool]:
+        """Returns (conflict-free destination path, same_device)."""
+        folder = self._folder(self.directory(f))
+        dest_path = folder.reserve(f.get("new_name", f["name"]))
+        same_device = folder.dev is not None and self._source_dev(f["path"]) == folder.dev
+        return dest_path, same_device
+
+
+def plan_moves(files: Iterable[dict], output_dir: str,
+               placement=None) -> Iterator[tuple[dict, str, bool]]:
+    """
+    Yields (file, destination, same_device) for each file, in input order.
+    Destinations never collide with each other or with existing files.
+    """
+    planner = _MovePlanner(output_dir, placement)
+    for f in files:
+        dest_path, same_device = planner.plan(f)
+        yield f, dest_path, same_device
+
 
+def _relocate(src: str, dest: str, same_device: bool,
+              copier: Callable[[str, str], None] | None = None) -> bool:
+    """
+    Atomic rename on the same device, copy + delete otherwise (symlinks
+    are re-created as symlinks).
+    Returns True if the file was renamed rather than copied.
+    """
+    if same_device:
+        try:
+            if metrics.ENABLED:
+                metrics.syscall("rename")
+            os.rename(src, dest)
+            return True
+        except OSError as e:
+            if e.errno != errno.EXDEV:  # e.g. bind mounts report the same st_dev
+                raise
+    if metrics.ENABLED:
+        metrics.syscall("copy")
+        metrics.syscall("unlink")
+    if os.path.islink(src):
+        # Move the link itself, as shutil.move does, not the file it points to
+        os.symlink(os.readlink(src), dest)
+    else:
+        (copier or copy_file)(src, dest)
+    os.remove(src)
+    return False
+
+
+def _move_single(f: dict, dest_path: str, same_device: bool = False,
+                 copier: Callable[[str, str], None] | None = None,
+                 progress: Callable[[int], None] | None = None) -> dict:
+    """Moves a single file to its planned destination. Called in parallel."""
+    if metrics.ENABLED:
+        start = time.perf_counter()
     result = {
         "original": f["path"],
         "destination": dest_path,
-        "category": category,
+        "category": f.get("category", "Miscellaneous"),
         "size_bytes": f["size_bytes"],
         "status": "pending",
     }
 
     try:
-        os.makedirs(dest_folder, exist_ok=True)
-
-        # Avoid overwriting: append counter if needed
-        if os.path.exists(dest_path):
-            base, ext = os.path.splitext(dest_path)
-            i = 1
-            while os.path.exists(f"{base}_{i}{ext}"):
-                i += 1
-            dest_path = f"{base}_{i}{ext}"
-            result["destination"] = dest_path
-
-        shutil.move(f["path"], dest_path)
+        renamed = _relocate(f["path"], dest_path, same_device, copier)
+        if renamed and progress is not None:
+            progress(f["size_bytes"])  # Copies report their own bytes
         result["status"] = "success"
-        logger.info(f"Moved: {f['path']} → {dest_path}")
+        # %-style so the message is only built when INFO is enabled
+        logger.info("Moved: %s → %s", f["path"], dest_path)
 
     except PermissionError:
         result["status"] = "error_permission"
@@ -50,30 +266,128 @@ def _move_single(f: dict, output_dir: str) -> dict:
         result["status"] = f"error: {e}"
         logger.error(f"Failed to move {f['path']}: {e}")
 
+    if metrics.ENABLED:
+        metrics.observe_move(start, time.perf_counter() - start,
+                             f["size_bytes"], result["status"] == "success")
     return result
 
 
-def organize_files(files: list[dict], output_dir: str, dry_run: bool = False) -> list[dict]:
+def _run_moves(moves: Iterable[tuple[dict, str, bool]], policy: ExecutionPolicy,
+               copier: Callable[[str, str], None] | None,
+               progress: Callable[[int], None] | None,
+               collect: Callable[[dict], None]) -> None:
+    """Runs planned moves on a thread pool, keeping limit.limit in flight."""
+    limit = _ConcurrencyLimit(max(policy.threads, 1))
+    tuner = _AdaptiveTuner(policy, limit) if policy.adaptive else None
+    pool_size = max(policy.max_threads if policy.adaptive else policy.threads, 1)
+
+    def run(move: tuple[dict, str, bool]) -> None:
+        try:
+            collect(_move_single(*move, copier=copier, progress=progress))
+            if tuner is not None:
+                tuner.record()
+        finally:
+            limit.release()
+
+    failures: list[BaseException] = []
+
+    def reap(future) -> None:
+        # Errors from collect (journal, on_result, log writer) must not vanish
+        error = future.exception()
+        if error is not None:
+            failures.append(error)
+
+    with ThreadPoolExecutor(max_workers=pool_size) as executor:
+        for move in moves:
+            if failures:
+                break  # Stop queueing; the moves in flight still finish
+            limit.acquire()
+            executor.submit(run, move).add_done_callback(reap)
+    if failures:
+        raise failures[0]
+
+
+def organize_files(files: Iterable[dict], output_dir: str, dry_run: bool = False,
+                   policy: ExecutionPolicy | None = None,
+                   progress: Callable[[int], None] | None = None,
+                   on_result: Callable[[dict], None] | None = None,
+                   keep_results: bool = True,
+                   journal=None,
+                   placement=None) -> list[dict]:
     """
     Moves files into output_dir/Category/ using parallel threads for speed.
-    Returns a list of result dicts with status.
+    Accepts a list or a streaming iterator (e.g. scanner.iter_directory piped
+    through classifier.iter_classify and renamer.iter_assign_names), in which
+    case moves start while the scan is still running.
+    policy controls thread count, process-pool copies and adaptive tuning
+    (default: MAX_WORKERS fixed threads).
+    progress(n) is called from worker threads as n more bytes are done:
+    per chunk for cross-device copies, per file for renames.
+    on_result(result) is called as each move completes, one call at a time.
+    journal (a journal.MoveJournal) records every planned move before it
+    starts and every result, so a crashed run can be resumed or undone.
+    placement (a placement.PlacementPolicy) chooses each file's folder in
+    place of output_dir/Category; list input is counted with
+    placement.prepare() first.
+    Returns a list of result dicts with status (empty if keep_results is
+    False, for runs that stream results through on_result instead).
     """
+    results: list[dict] = []
+    lock = threading.Lock()
+
+    def collect(result: dict) -> None:
+        with lock:
+            if journal is not None:
+                journal.record(result)
+            if keep_results:
+                results.append(result)
+            if on_result is not None:
+                on_result(result)
+
+    if placement is not None and isinstance(files, list):
+        placement.prepare(files)
+
     if dry_run:
-        return [
-            {
+        planner = _MovePlanner(output_dir, placement, dry_run=True)
+        for f in files:
+            collect({
                 "original": f["path"],
-                "destination": os.path.join(output_dir, f.get("category", "Miscellaneous"), f.get("new_name", f["name"])),
+                "destination": os.path.join(planner.directory(f), f.get("new_name", f["name"])),
                 "category": f.get("category", "Miscellaneous"),
                 "size_bytes": f["size_bytes"],
                 "status": "dry_run",
-            }
-            for f in files
-        ]
+            })
+        return results
+
+    with metrics.stage("move"):
+        _execute_moves(files, output_dir, policy or ExecutionPolicy(), progress, collect,
+                       journal, placement)
+    return results
+
+
+def _execute_moves(files: Iterable[dict], output_dir: str, policy: ExecutionPolicy,
+                   progress: Callable[[int], None] | None,
+                   collect: Callable[[dict], None], journal=None, placement=None) -> None:
+    """The non-dry-run body of organize_files."""
+    # Every target is settled here, on one thread, before its move is queued
+    moves = plan_moves(files, output_dir, placement)
+    if journal is not None:
+        moves = journal.plan(moves)  # Each move starts only once its plan is on disk
+    if isinstance(files, list):
+        moves = list(moves)
 
-    results = []
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        futures = {executor.submit(_move_single, f, output_dir): f for f in files}
-        for future in as_completed(futures):
-            results.append(future.result())
+    if policy.copy_processes <= 0:
+        copier = None
+        if progress is not None:
+            def copier(src: str, dest: str) -> None:
+                copy_file(src, dest, progress)
+        _run_moves(moves, policy, copier, progress, collect)
+        return
 
-    return results
\ No newline at end of file
+    with ProcessPoolExecutor(max_workers=policy.copy_processes) as copy_pool:
+        def copier(src: str, dest: str) -> None:
+            # Callbacks can't cross processes: report the file once it's done
+            copied = copy_pool.submit(copy_file, src, dest).result()
+            if progress is not None:
+                progress(copied)
+        _run_moves(moves, policy, copier, progress, collect)
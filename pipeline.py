@@ -0,0 +1,294 @@
+"""
+pipeline.py — Runs scan → classify → rename → move as overlapping stages.
+
+Each stage runs on its own thread(s) and hands records to the next through
+a bounded queue, so a slow stage applies backpressure instead of letting
+records pile up, and the first move starts as soon as the first file is
+found. Per-stage counters show where the time goes.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator
+
+import metrics
+
+PIPELINE_QUEUE_DEPTH = 1024  # Records buffered between two stages
+
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    name: str
+    items: int = 0
+    busy_seconds: float = 0.0
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    @property
+    def items_per_second(self) -> float:
+        """Throughput while the stage was actually working."""
+        return self.items / self.busy_seconds if self.busy_seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "items": self.items,
+            "busy_seconds": round(self.busy_seconds, 6),
+            "items_per_second": round(self.items_per_second, 1),
+        }
+
+
+@dataclass
+class _Stage:
+    stats: StageStats
+    fn: Callable[[dict], dict | None]
+    workers: int
+    output: queue.Queue = field(default=None)
+
+
+class Pipeline:
+    """
+    Usage:
+        pipe = Pipeline(iter_directory(src), source_name="scan")
+        pipe.stage("classify", classify_one).stage("rename", rename_one)
+        for f in pipe:          # records arrive while the scan is running
+            ...
+        pipe.stats              # [StageStats(scan), StageStats(classify), …]
+
+    A stage function returns the (possibly modified) record, or None to drop
+    it. Stages with workers > 1 may reorder records.
+    """
+
+    def __init__(self, source: Iterable[dict], source_name: str = "source",
+                 maxsize: int = PIPELINE_QUEUE_DEPTH):
+        self._source = source
+        self._maxsize = maxsize
+        self._source_stats = StageStats(source_name)
+        self._stages: list[_Stage] = []
+        self._error: BaseException | None = None
+        self._stop = threading.Event()
+
+    @property
+    def stats(self) -> list[StageStats]:
+        return [self._source_stats] + [s.stats for s in self._stages]
+
+    def stage(self, name: str, fn: Callable[[dict], dict | None],
+              workers: int = 1) -> "Pipeline":
+        self._stages.append(_Stage(StageStats(name), fn, max(workers, 1)))
+        return self
+
+    def _fail(self, error: BaseException) -> None:
+        if self._error is None:
+            self._error = error
+        self._stop.set()
+
+    def _put(self, q: queue.Queue, item) -> bool:
+        """Blocking put that gives up if the pipeline is stopping."""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue):
+        """Blocking get that reports _DONE once the pipeline is stopping and q is empty."""
+        while True:
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return _DONE
+
+    def _run_source(self, out: queue.Queue) -> None:
+        stats = self._source_stats
+        stats.started_at = time.perf_counter()
+        try:
+            it = iter(self._source)
+            while True:
+                t0 = time.perf_counter()
+                try:
+                    item = next(it)
+                except StopIteration:
+                    break
+                stats.busy_seconds += time.perf_counter() - t0
+                stats.items += 1
+                if not self._put(out, item):
+                    break
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            stats.finished_at = time.perf_counter()
+            self._put(out, _DONE)
+
+    def _run_stage(self, stage: _Stage, inp: queue.Queue,
+                   remaining: list[int], lock: threading.Lock) -> None:
+        stats = stage.stats
+        with lock:
+            if stats.started_at is None:
+                stats.started_at = time.perf_counter()
+        try:
+            while True:
+                item = self._get(inp)
+                if item is _DONE:
+                    self._put(inp, _DONE)  # Let sibling workers see it too
+                    break
+                if self._stop.is_set():
+                    continue  # Drain so upstream never blocks
+                t0 = time.perf_counter()
+                result = stage.fn(item)
+                elapsed = time.perf_counter() - t0
+                with lock:
+                    stats.busy_seconds += elapsed
+                    stats.items += 1
+                if result is not None:
+                    self._put(stage.output, result)
+        except BaseException as e:
+            self._fail(e)
+            # Keep draining so upstream threads can finish
+            while self._get(inp) is not _DONE:
+                pass
+        finally:
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+                if last:
+                    stats.finished_at = time.perf_counter()
+            if last:
+                # Never blocks on a full queue once the consumer has stopped
+                self._put(stage.output, _DONE)
+
+    def __iter__(self) -> Iterator[dict]:
+        head: queue.Queue = queue.Queue(maxsize=self._maxsize)
+        threads = [threading.Thread(target=self._run_source, args=(head,), daemon=True)]
+        inp = head
+        for stage in self._stages:
+            stage.output = queue.Queue(maxsize=self._maxsize)
+            remaining = [stage.workers]
+            lock = threading.Lock()
+            for _ in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._run_stage, args=(stage, inp, remaining, lock), daemon=True
+                ))
+            inp = stage.output
+
+        for t in threads:
+            t.start()
+        try:
+            while True:
+                item = self._get(inp)
+                if item is _DONE or self._stop.is_set():
+                    break
+                yield item
+        finally:
+            self._stop.set()  # Unblocks everything if the consumer stopped early
+            for t in threads:
+                t.join()
+        if self._error is not None:
+            raise self._error
+
+
+@dataclass
+class PipelineRun:
+    results: list[dict]
+    stats: list[StageStats]
+    first_move_seconds: float | None  # From start to the first finished move
+    total_seconds: float
+
+    def stats_dicts(self) -> list[dict]:
+        return [s.as_dict() for s in self.stats]
+
+
+def run_organize_pipeline(
+    source_dir: str,
+    output_dir: str,
+    dry_run: bool = False,
+    policy=None,
+    on_file: Callable[[dict], None] | None = None,
+    on_result: Callable[[dict], None] | None = None,
+    keep_results: bool = True,
+    maxsize: int = PIPELINE_QUEUE_DEPTH,
+    journal=None,
+    sniffer=None,
+    placement=None,
+    progress: Callable[[int], None] | None = None,
+) -> PipelineRun:
+    """
+    Scan, classify, rename and organize source_dir with all stages running
+    at once. on_file sees every renamed record (e.g. ReportAccumulator.add_file);
+    on_result sees every move result as it completes. progress, journal and
+    placement are passed on to organize_files (placement shards categories
+    as they fill up, since the totals aren't known while scanning). With a
+    sniffer (sniffer.ContentSniffer), files the extension can't place go
+    through an extra multi-threaded "sniff" stage that reads their first
+    bytes.
+    """
+    from classifier import classify_file
+    from organizer import organize_files
+    from renamer import generate_name
+    from scanner import iter_directory
+
+    def classify(f: dict) -> dict:
+        f["category"] = classify_file(f)
+        return f
+
+    counters: dict[str, int] = {}
+
+    def rename(f: dict) -> dict:  # Single worker: counters stay sequential
+        cat = f.get("category", "Miscellaneous")
+        counters[cat] = counters.get(cat, 0) + 1
+        f["new_name"] = generate_name(f, counters[cat])
+        if on_file is not None:
+            on_file(f)
+        return f
+
+    # Never walk into the output folder or other tiers: they fill up while we scan
+    exclude = [output_dir] + (placement.tier_dirs() if placement is not None else [])
+    files = iter_directory(source_dir, compact=True, exclude=exclude)
+    pipe = Pipeline(files, "scan", maxsize)
+    pipe.stage("classify", classify)
+    if sniffer is not None:
+        from sniffer import needs_sniffing
+
+        def sniff(f: dict) -> dict:
+            if needs_sniffing(f):
+                f["category"] = sniffer.sniff(f["path"]) or f["category"]
+            return f
+
+        pipe.stage("sniff", sniff, workers=sniffer.workers)
+    pipe.stage("rename", rename)
+
+    move_stats = StageStats("move")
+    start = time.perf_counter()
+    first_move = None
+
+    def collect(result: dict) -> None:
+        nonlocal first_move
+        if first_move is None:
+            first_move = time.perf_counter() - start
+            move_stats.started_at = time.perf_counter()
+        move_stats.items += 1
+        if on_result is not None:
+            on_result(result)
+
+    results = organize_files(pipe, output_dir, dry_run=dry_run, policy=policy,
+                             progress=progress, on_result=collect, keep_results=keep_results,
+                             journal=journal, placement=placement)
+    total = time.perf_counter() - start
+    move_stats.finished_at = time.perf_counter()
+    if move_stats.started_at is not None:
+        # Moves overlap each other; wall time of the move phase is the fair measure
+        move_stats.busy_seconds = move_stats.finished_at - move_stats.started_at
+
+    if metrics.ENABLED:
+        # The scanner counts its own files and the move stage times itself
+        for stats in pipe.stats:
+            items = stats.items if stats.name != "scan" else 0
+            metrics.add(stats.name, files=items, seconds=stats.busy_seconds)
+
+    return PipelineRun(results, pipe.stats + [move_stats], first_move, total)
@@ -0,0 +1,133 @@
+"""
+placement.py — Decides which folder each file is moved into.
+
+By default every file goes to output_dir/Category/. A PlacementPolicy,
+passed to organize_files(placement=...), can instead send huge files to
+another volume, old files to an archive tier, and split big categories
+into Category/YYYY/MM/ so no folder ends up with tens of thousands of
+entries (every lookup and listing in such a folder is slow).
+
+    policy = PlacementPolicy(large_file_bytes=1024 ** 3, large_dir="/mnt/bulk",
+                             shard_threshold=5000)
+    organize_files(files, out, placement=policy)
+"""
+
+import os
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Iterable
+
+SHARD_THRESHOLD = 5000           # A sensible shard_threshold for big collections
+LARGE_DIRNAME = "Large Files"    # Under output_dir when no large_dir is given
+ARCHIVE_DIRNAME = "Old Files"    # Under output_dir when no archive_dir is given
+
+
+@dataclass
+class PlacementPolicy:
+    """
+    Checked in this order for each file:
+      large_file_bytes    files at least this big go to large_dir/Category/
+      archive_after_days  files not modified for this long go to archive_dir/Category/
+      shard_threshold     categories with more files than this (or listed in
+                          shard_categories) go to output_dir/Category/YYYY/MM/
+    Everything else stays together in output_dir/Category/. Sharding is off
+    unless shard_threshold or shard_categories is set.
+    Files already in output_dir/Category/ from earlier runs count towards
+    the threshold. Call prepare(files) with the full list first to shard
+    whole categories; without it (streaming), a category is split once it
+    has filled up to shard_threshold files, so its top folder never grows
+    past that.
+    """
+    large_file_bytes: int | None = None
+    large_dir: str | None = None
+    archive_after_days: int | None = None
+    archive_dir: str | None = None
+    shard_threshold: int | None = None
+    shard_categories: set[str] = field(default_factory=set)
+
+    def __post_init__(self):
+        self._counts: dict[str, int] | None = None  # From prepare()
+        self._seen: dict[str, int] = {}             # Files at the top level, existing + placed
+        self._ages: dict[str, int] = {}
+        self._today = date.today()
+
+    def tier_dirs(self) -> list[str]:
+        """Explicit large / archive folders, which scans of the source must skip."""
+        return [d for d in (self.large_dir, self.archive_dir) if d]
+
+    def _age_days(self, modified: str) -> int:
+        age = self._ages.get(modified)
+        if age is None:
+            try:
+                age = (self._today - date.fromisoformat(modified)).days
+            except ValueError:
+                age = 0
+            self._ages[modified] = age
+        return age
+
+    def _tier(self, f: dict, output_dir: str) -> str | None:
+        """The large or archive base folder for f, or None for the normal tier."""
+        if self.large_file_bytes is not None and f["size_bytes"] >= self.large_file_bytes:
+            return self.large_dir or os.path.join(output_dir, LARGE_DIRNAME)
+        if (self.archive_after_days is not None
+                and self._age_days(f.get("modified", "")) >= self.archive_after_days):
+            return self.archive_dir or os.path.join(output_dir, ARCHIVE_DIRNAME)
+        return None
+
+    def prepare(self, files: Iterable[dict]) -> None:
+        """Counts the files each category will receive in the normal tier."""
+        counts: dict[str, int] = {}
+        for f in files:
+            if self._tier(f, "") is None:
+                category = f.get("category", "Miscellaneous")
+                counts[category] = counts.get(category, 0) + 1
+        self._counts = counts
+        self._seen = {}
+
+    @staticmethod
+    def _existing(base: str, names: Callable[[str], Iterable[str]] | None) -> int:
+        """Files already at the top of base; YYYY shard folders don't count."""
+        if names is not None:
+            listing = names(base)
+        else:
+            try:
+                listing = os.listdir(base)
+            except OSError:
+                listing = ()
+        return sum(1 for n in listing if not (len(n) == 4 and n.isdigit()))
+
+    def _sharded(self, category: str, base: str,
+                 names: Callable[[str], Iterable[str]] | None) -> bool:
+        if category in self.shard_categories:
+            return True
+        if self.shard_threshold is None:
+            return False
+        seen = self._seen.get(category)
+        if seen is None:
+            seen = self._existing(base, names)
+            if self._counts is not None:
+                seen += self._counts.get(category, 0)
+            self._seen[category] = seen
+        if self._counts is not None:
+            return seen > self.shard_threshold  # The whole run's files, decided once
+        if seen >= self.shard_threshold:
+            return True
+        self._seen[category] = seen + 1
+        return False
+
+    def directory(self, f: dict, output_dir: str,
+                  names: Callable[[str], Iterable[str]] | None = None) -> str:
+        """
+        The folder f should be moved into. names(folder) lists a folder's
+        entries (the planner passes its cached listing); without it the
+        category folder is listed once here.
+        """
+        category = f.get("category", "Miscellaneous")
+        tier = self._tier(f, output_dir)
+        if tier is not None:
+            return os.path.join(tier, category)
+        base = os.path.join(output_dir, category)
+        if self._sharded(category, base, names):
+            year, _, month = f.get("modified", "")[:7].partition("-")
+            return os.path.join(base, year or "0000", month or "00")
+        return base
@@ -0,0 +1,73 @@
+"""
+records.py — Compact per-file record used instead of plain dicts.
+"""
+
+import sys
+from typing import Any, Iterator
+
+_MISSING = object()
+
+
+class FileRecord:
+    """
+    A file info record with fixed __slots__ instead of a per-file dict.
+    Extension, category and date strings are interned so millions of
+    records share one copy of ".js" / "Code" / "2026-02-20".
+    Supports the dict-style access (f["name"], f.get(), "key" in f,
+    f["category"] = ...) used throughout the pipeline.
+    """
+
+    __slots__ = (
+        "name", "path", "extension", "size_bytes", "modified",
+        "category", "new_name", "duplicate_of", "hardlinked",
+    )
+    _INTERNED = frozenset(("extension", "modified", "category"))
+
+    def __init__(self, name: str, path: str, extension: str,
+                 size_bytes: int, modified: str):
+        self.name = name
+        self.path = path
+        self.extension = sys.intern(extension)
+        self.size_bytes = size_bytes
+        self.modified = sys.intern(modified)
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "FileRecord":
+        rec = cls(d["name"], d["path"], d["extension"], d["size_bytes"], d["modified"])
+        for key in cls.__slots__:
+            if key in d and not hasattr(rec, key):
+                rec[key] = d[key]
+        return rec
+
+    # ── dict compatibility ────────────────────────────
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._INTERNED and isinstance(value, str):
+            value = sys.intern(value)
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__ and hasattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def keys(self) -> Iterator[str]:
+        return (k for k in self.__slots__ if hasattr(self, k))
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        return ((k, getattr(self, k)) for k in self.keys())
+
+    def to_dict(self) -> dict:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"FileRecord({self.to_dict()!r})"
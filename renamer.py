@@ -4,6 +4,7 @@ Format: [Category]_[YYYY-MM-DD]_[NNN][.ext]
 """
 
 import os
+from typing import Iterable, Iterator
 
 
 def generate_name(file_info: dict, counter: int) -> str:
@@ -17,16 +18,26 @@ def generate_name(file_info: dict, counter: int) -> str:
     return f"{category}_{date}_{padded}{ext}"
 
 
-def assign_new_names(files: list[dict]) -> list[dict]:
+def iter_assign_names(files: Iterable[dict]) -> Iterator[dict]:
     """
-    Assigns a 'new_name' field to every file dict.
-    Counter is per-category so numbering stays clean.
+    Streaming version of assign_new_names.
+    Yields each file dict as soon as its 'new_name' is set.
     """
     counters: dict[str, int] = {}
     for f in files:
         cat = f.get("category", "Miscellaneous")
         counters[cat] = counters.get(cat, 0) + 1
         f["new_name"] = generate_name(f, counters[cat])
+        yield f
+
+
+def assign_new_names(files: list[dict]) -> list[dict]:
+    """
+    Assigns a 'new_name' field to every file dict.
+    Counter is per-category so numbering stays clean.
+    """
+    for _ in iter_assign_names(files):
+        pass
     return files
 
 
@@ -1,109 +1,232 @@
 
 import json
 import os
+import re
+from html import escape
+from itertools import islice
 from datetime import datetime
 from collections import defaultdict
+from typing import Iterable, Iterator
 
+try:
+    import orjson  # Optional: much faster JSON encoder
+except ImportError:
+    orjson = None
 
-def build_report(files: list[dict], results: list[dict], output_dir: str) -> dict:
+import metrics
 
-    category_stats = defaultdict(lambda: {"count": 0, "total_bytes": 0, "extensions": set()})
-    extension_counts = defaultdict(int)
-    largest_file = None
-    largest_size = 0
 
-    for f in files:
+class ReportAccumulator:
+    """
+    Builds the report incrementally, one file / result at a time, in
+    O(categories + extensions) memory. Partial accumulators from parallel
+    workers can be combined with merge().
+    """
+
+    def __init__(self):
+        self.total_files = 0
+        self.category_stats = defaultdict(lambda: {"count": 0, "total_bytes": 0, "extensions": set()})
+        self.extension_counts = defaultdict(int)
+        self.largest_file = None
+        self.largest_size = 0
+        self.duplicate_count = 0
+        self.duplicate_bytes = 0
+        self.reclaimed_bytes = 0  # Only duplicates actually replaced by hard links
+        self.status_counts = defaultdict(int)  # All error statuses count as "error"
+
+    def add_file(self, f: dict) -> None:
         cat = f.get("category", "Miscellaneous")
         size = f.get("size_bytes", 0)
         ext = f.get("extension", "unknown")
 
-        category_stats[cat]["count"] += 1
-        category_stats[cat]["total_bytes"] += size
-        category_stats[cat]["extensions"].add(ext)
-        extension_counts[ext] += 1
+        self.total_files += 1
+        stats = self.category_stats[cat]
+        stats["count"] += 1
+        stats["total_bytes"] += size
+        stats["extensions"].add(ext)
+        self.extension_counts[ext] += 1
 
-        if size > largest_size:
-            largest_size = size
-            largest_file = f["name"]
+        if size > self.largest_size:
+            self.largest_size = size
+            self.largest_file = f["name"]
 
-    # Convert sets to lists for JSON serialization
-    for cat in category_stats:
-        category_stats[cat]["extensions"] = sorted(
-            list(category_stats[cat]["extensions"])
-        )
+        if f.get("duplicate_of"):
+            self.duplicate_count += 1
+            self.duplicate_bytes += size
+            if f.get("hardlinked"):
+                self.reclaimed_bytes += size
+
+    def add_result(self, r: dict) -> None:
+        status = str(r.get("status", ""))
+        self.status_counts["error" if status.startswith("error") else status] += 1
+
+    def track(self, files: Iterable[dict]) -> Iterator[dict]:
+        """Passes files through unchanged while counting them."""
+        for f in files:
+            self.add_file(f)
+            yield f
+
+    def merge(self, other: "ReportAccumulator") -> "ReportAccumulator":
+        """Folds another accumulator into this one and returns self."""
+        self.total_files += other.total_files
+        for cat, theirs in other.category_stats.items():
+            ours = self.category_stats[cat]
+            ours["count"] += theirs["count"]
+            ours["total_bytes"] += theirs["total_bytes"]
+            ours["extensions"] |= theirs["extensions"]
+        for ext, count in other.extension_counts.items():
+            self.extension_counts[ext] += count
+        if other.largest_size > self.largest_size:
+            self.largest_size = other.largest_size
+            self.largest_file = other.largest_file
+        self.duplicate_count += other.duplicate_count
+        self.duplicate_bytes += other.duplicate_bytes
+        self.reclaimed_bytes += other.reclaimed_bytes
+        for status, count in other.status_counts.items():
+            self.status_counts[status] += count
+        return self
+
+    def build(self, output_dir: str) -> dict:
+        categories = {
+            cat: {
+                "count": stats["count"],
+                "total_bytes": stats["total_bytes"],
+                # Convert sets to lists for JSON serialization
+                "extensions": sorted(stats["extensions"]),
+            }
+            for cat, stats in self.category_stats.items()
+        }
+        counts = self.extension_counts
+        most_common_ext = max(counts, key=counts.get) if counts else "N/A"
+
+        report = {
+            "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "output_directory": output_dir,
+            "summary": {
+                "total_files": self.total_files,
+                "files_organized": self.status_counts.get("success", 0),
+                "files_failed": self.status_counts.get("error", 0),
+                "total_categories": len(categories),
+                "largest_file": self.largest_file or "N/A",
+                "largest_file_bytes": self.largest_size,
+                "most_common_extension": most_common_ext,
+                "duplicate_files": self.duplicate_count,
+                "duplicate_bytes": self.duplicate_bytes,  # Their total size, freed or not
+                "bytes_reclaimed": self.reclaimed_bytes,
+            },
+            "categories": categories,
+            "extension_breakdown": dict(counts),
+        }
+        if metrics.ENABLED:
+            report["metrics"] = metrics.snapshot()
+        return report
+
+
+def build_report(files: Iterable[dict], results: Iterable[dict], output_dir: str) -> dict:
+    acc = ReportAccumulator()
+    for f in files:
+        acc.add_file(f)
+    for r in results:
+        acc.add_result(r)
+    return acc.build(output_dir)
 
-    success_count = sum(1 for r in results if r.get("status") == "success")
-    error_count = sum(1 for r in results if str(r.get("status", "")).startswith("error"))
-
-    most_common_ext = max(extension_counts, key=extension_counts.get) if extension_counts else "N/A"
-
-    report = {
-        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "output_directory": output_dir,
-        "summary": {
-            "total_files": len(files),
-            "files_organized": success_count,
-            "files_failed": error_count,
-            "total_categories": len(category_stats),
-            "largest_file": largest_file or "N/A",
-            "largest_file_bytes": largest_size,
-            "most_common_extension": most_common_ext,
-        },
-        "categories": dict(category_stats),
-        "extension_breakdown": dict(extension_counts),
-    }
 
-    return report
+def _dumps_compact(obj) -> bytes:
+    """Compact JSON with the fastest encoder available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
 
 
-def save_json_report(report: dict, output_dir: str) -> str:
+def save_json_report(report: dict, output_dir: str, compact: bool = False) -> str:
     path = os.path.join(output_dir, "organizer_report.json")
+    if compact:
+        with open(path, "wb") as f:
+            f.write(_dumps_compact(report))
+        return path
     with open(path, "w") as f:
         json.dump(report, f, indent=2)
     return path
 
 
-def save_html_report(report: dict, output_dir: str) -> str:
-    """Generates a slick HTML dashboard."""
+class MoveLogWriter:
+    """
+    Appends one JSON line per organize result to organizer_moves.ndjson.
+    Pass write as organize_files(on_result=...) so lines land as moves
+    complete; output is flushed every FLUSH_EVERY lines so it can be tailed
+    (long-running callers such as watch mode call flush() after each batch).
 
-    cats = report["categories"]
-    ext_breakdown = report["extension_breakdown"]
-    summary = report["summary"]
+        with MoveLogWriter(out) as log:
+            organize_files(files, out, on_result=log.write)
+    """
 
-    # Build category rows
-    cat_rows = ""
-    cat_chart_labels = []
-    cat_chart_data = []
-
-    ICONS = {
-        "Documents": "📄", "Images": "🖼️", "Videos": "🎬",
-        "Audio": "🎵", "Code": "💻", "Archives": "🗜️",
-        "Spreadsheets": "📊", "Presentations": "📽️", "Finance": "💰",
-        "Academic": "🎓", "Career": "💼", "Screenshots": "📸",
-        "Backups": "💾", "Installers": "⚙️", "Executables": "🔧",
-        "Miscellaneous": "📦",
-    }
+    FILENAME = "organizer_moves.ndjson"
+    FLUSH_EVERY = 256
 
-    for cat, data in sorted(cats.items(), key=lambda x: -x[1]["count"]):
-        icon = ICONS.get(cat, "📁")
-        mb = data["total_bytes"] / (1024 * 1024)
-        exts = ", ".join(data["extensions"][:6]) or "—"
-        cat_rows += f"""
-        <tr>
-          <td><span class="cat-icon">{icon}</span> {cat}</td>
-          <td><span class="badge">{data['count']}</span></td>
-          <td>{mb:.2f} MB</td>
-          <td class="ext-cell">{exts}</td>
-        </tr>"""
-        cat_chart_labels.append(cat)
-        cat_chart_data.append(data["count"])
+    def __init__(self, output_dir: str, append: bool = False):
+        os.makedirs(output_dir, exist_ok=True)
+        self.path = os.path.join(output_dir, self.FILENAME)
+        self._fh = open(self.path, "ab" if append else "wb")
+        self._pending = 0
 
-    # Extension breakdown (top 10)
-    top_exts = sorted(ext_breakdown.items(), key=lambda x: -x[1])[:10]
-    ext_labels = [e[0] or "no-ext" for e in top_exts]
-    ext_data = [e[1] for e in top_exts]
+    def write(self, result: dict) -> None:
+        self._fh.write(_dumps_compact(result) + b"\n")
+        self._pending += 1
+        if self._pending >= self.FLUSH_EVERY:
+            self._fh.flush()
+            self._pending = 0
+
+    def flush(self) -> None:
+        self._fh.flush()
+        self._pending = 0
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def __enter__(self) -> "MoveLogWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_SLOT = re.compile(r"@@(\w+)@@")
 
-    html = f"""<!DOCTYPE html>
+
+def _compile_template(text: str) -> list[str]:
+    """Splits a template into alternating static segments and slot names."""
+    return _SLOT.split(text)
+
+
+def _render(segments: list[str], values: dict, fh) -> None:
+    """
+    Writes a compiled template straight to fh. Slot values may be strings
+    or iterables of strings (e.g. row generators), which are streamed.
+    """
+    for i, part in enumerate(segments):
+        if i % 2 == 0:
+            fh.write(part)
+        else:
+            value = values[part]
+            if isinstance(value, str):
+                fh.write(value)
+            else:
+                fh.writelines(value)
+
+
+ICONS = {
+    "Documents": "📄", "Images": "🖼️", "Videos": "🎬",
+    "Audio": "🎵", "Code": "💻", "Archives": "🗜️",
+    "Spreadsheets": "📊", "Presentations": "📽️", "Finance": "💰",
+    "Academic": "🎓", "Career": "💼", "Screenshots": "📸",
+    "Backups": "💾", "Installers": "⚙️", "Executables": "🔧",
+    "Miscellaneous": "📦",
+}
+
+FILES_PER_PAGE = 1000  # Rows per page of the per-file table
+FILES_DIRNAME = "organizer_report_files"
+
+_REPORT_HTML = _compile_template("""<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="UTF-8"/>
@@ -112,7 +235,7 @@ def save_html_report(report: dict, output_dir: str) -> str:
   <link href="https://fonts.googleapis.com/css2?family=Space+Mono:wght@400;700&family=Syne:wght@400;700;800&display=swap" rel="stylesheet"/>
   <script src="https://cdnjs.cloudflare.com/ajax/libs/Chart.js/4.4.0/chart.umd.min.js"></script>
   <style>
-    :root {{
+    :root {
       --bg: #0a0a0f;
       --surface: #111118;
       --card: #16161f;
@@ -123,65 +246,65 @@ def save_html_report(report: dict, output_dir: str) -> str:
       --muted: #6b6b8a;
       --success: #00e676;
       --danger: #ff5252;
-    }}
-    * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-    body {{
+    }
+    * { margin: 0; padding: 0; box-sizing: border-box; }
+    body {
       font-family: "sans-serif", Arial, Helvetica, sans-serif;
       background: var(--bg);
       color: var(--text);
       min-height: 100vh;
       padding: 2rem;
-    }}
-    .noise {{
+    }
+    .noise {
       position: fixed; inset: 0; pointer-events: none; z-index: 0;
       background-image: url("data:image/svg+xml,%3Csvg viewBox='0 0 256 256' xmlns='http://www.w3.org/2000/svg'%3E%3Cfilter id='noise'%3E%3CfeTurbulence type='fractalNoise' baseFrequency='0.9' numOctaves='4' stitchTiles='stitch'/%3E%3C/filter%3E%3Crect width='100%25' height='100%25' filter='url(%23noise)' opacity='0.04'/%3E%3C/svg%3E");
-    }}
-    .container {{ max-width: 1100px; margin: 0 auto; position: relative; z-index: 1; }}
-    header {{ margin-bottom: 3rem; border-bottom: 1px solid var(--border); padding-bottom: 2rem; }}
-    .header-top {{ display: flex; align-items: center; gap: 1rem; margin-bottom: 0.5rem; }}
-    .logo {{ font-family: 'Space Mono', monospace; font-size: 0.75rem; color: var(--muted);
-             letter-spacing: 0.05em; }}
-    h1 {{ font-size: 2.5rem; font-weight: 800; letter-spacing: -0.02em; }}
-    h1 span {{ color: var(--accent); }}
-    .meta {{ font-family: 'Space Mono', monospace; font-size: 0.75rem; color: var(--muted); margin-top: 0.5rem; }}
-    .stats-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
-                   gap: 1rem; margin-bottom: 2.5rem; }}
-    .stat-card {{
+    }
+    .container { max-width: 1100px; margin: 0 auto; position: relative; z-index: 1; }
+    header { margin-bottom: 3rem; border-bottom: 1px solid var(--border); padding-bottom: 2rem; }
+    .header-top { display: flex; align-items: center; gap: 1rem; margin-bottom: 0.5rem; }
+    .logo { font-family: 'Space Mono', monospace; font-size: 0.75rem; color: var(--muted);
+             letter-spacing: 0.05em; }
+    h1 { font-size: 2.5rem; font-weight: 800; letter-spacing: -0.02em; }
+    h1 span { color: var(--accent); }
+    .meta { font-family: 'Space Mono', monospace; font-size: 0.75rem; color: var(--muted); margin-top: 0.5rem; }
+    .stats-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
+                   gap: 1rem; margin-bottom: 2.5rem; }
+    .stat-card {
       background: var(--card); border: 1px solid var(--border); border-radius: 12px;
       padding: 1.4rem; position: relative; overflow: hidden;
       transition: border-color 0.2s;
-    }}
-    .stat-card::before {{
+    }
+    .stat-card::before {
       content: ''; position: absolute; top: 0; left: 0; right: 0; height: 2px;
       background: linear-gradient(90deg, var(--accent), var(--accent2));
-    }}
-    .stat-card:hover {{ border-color: var(--accent); }}
-    .stat-label {{ font-size: 0.7rem; font-family: 'Space Mono', monospace;
-                   text-transform: uppercase; letter-spacing: 0.08em; color: var(--muted); margin-bottom: 0.5rem; }}
-    .stat-value {{ font-size: 2rem; font-weight: 800; color: var(--accent); }}
-    .stat-sub {{ font-size: 0.75rem; color: var(--muted); margin-top: 0.3rem;
+    }
+    .stat-card:hover { border-color: var(--accent); }
+    .stat-label { font-size: 0.7rem; font-family: 'Space Mono', monospace;
+                   text-transform: uppercase; letter-spacing: 0.08em; color: var(--muted); margin-bottom: 0.5rem; }
+    .stat-value { font-size: 2rem; font-weight: 800; color: var(--accent); }
+    .stat-sub { font-size: 0.75rem; color: var(--muted); margin-top: 0.3rem;
                  font-family: 'Space Mono', monospace; white-space: nowrap;
-                 overflow: hidden; text-overflow: ellipsis; }}
-    .grid-2 {{ display: grid; grid-template-columns: 1fr 1fr; gap: 1.5rem; margin-bottom: 2rem; }}
-    @media (max-width: 700px) {{ .grid-2 {{ grid-template-columns: 1fr; }} }}
-    .card {{ background: var(--card); border: 1px solid var(--border); border-radius: 12px; padding: 1.5rem; }}
-    .card h2 {{ font-size: 0.8rem; font-family: 'Space Mono', monospace; text-transform: uppercase;
-                letter-spacing: 0.1em; color: var(--muted); margin-bottom: 1.2rem; }}
-    table {{ width: 100%; border-collapse: collapse; font-size: 0.875rem; }}
-    th {{ text-align: left; padding: 0.5rem 0.75rem; font-family: 'Space Mono', monospace;
+                 overflow: hidden; text-overflow: ellipsis; }
+    .grid-2 { display: grid; grid-template-columns: 1fr 1fr; gap: 1.5rem; margin-bottom: 2rem; }
+    @media (max-width: 700px) { .grid-2 { grid-template-columns: 1fr; } }
+    .card { background: var(--card); border: 1px solid var(--border); border-radius: 12px; padding: 1.5rem; }
+    .card h2 { font-size: 0.8rem; font-family: 'Space Mono', monospace; text-transform: uppercase;
+                letter-spacing: 0.1em; color: var(--muted); margin-bottom: 1.2rem; }
+    table { width: 100%; border-collapse: collapse; font-size: 0.875rem; }
+    th { text-align: left; padding: 0.5rem 0.75rem; font-family: 'Space Mono', monospace;
           font-size: 0.65rem; text-transform: uppercase; letter-spacing: 0.08em;
-          color: var(--muted); border-bottom: 1px solid var(--border); }}
-    td {{ padding: 0.75rem; border-bottom: 1px solid rgba(42,42,61,0.5); }}
-    tr:last-child td {{ border-bottom: none; }}
-    tr:hover td {{ background: rgba(0,229,255,0.03); }}
-    .cat-icon {{ font-size: 1.1rem; margin-right: 0.4rem; }}
-    .badge {{ background: rgba(0,229,255,0.1); color: var(--accent); font-family: 'Space Mono', monospace;
-              font-size: 0.75rem; padding: 0.2rem 0.5rem; border-radius: 4px; font-weight: 700; }}
-    .ext-cell {{ font-family: 'Space Mono', monospace; font-size: 0.72rem; color: var(--muted); }}
-    .chart-wrap {{ position: relative; height: 220px; }}
-    footer {{ text-align: center; margin-top: 3rem; padding-top: 2rem;
+          color: var(--muted); border-bottom: 1px solid var(--border); }
+    td { padding: 0.75rem; border-bottom: 1px solid rgba(42,42,61,0.5); }
+    tr:last-child td { border-bottom: none; }
+    tr:hover td { background: rgba(0,229,255,0.03); }
+    .cat-icon { font-size: 1.1rem; margin-right: 0.4rem; }
+    .badge { background: rgba(0,229,255,0.1); color: var(--accent); font-family: 'Space Mono', monospace;
+              font-size: 0.75rem; padding: 0.2rem 0.5rem; border-radius: 4px; font-weight: 700; }
+    .ext-cell { font-family: 'Space Mono', monospace; font-size: 0.72rem; color: var(--muted); }
+    .chart-wrap { position: relative; height: 220px; }
+    footer { text-align: center; margin-top: 3rem; padding-top: 2rem;
               border-top: 1px solid var(--border);
-              font-family: 'Space Mono', monospace; font-size: 0.7rem; color: var(--muted); }}
+              font-family: 'Space Mono', monospace; font-size: 0.7rem; color: var(--muted); }
   </style>
 </head>
 <body>
@@ -192,34 +315,34 @@ def save_html_report(report: dict, output_dir: str) -> str:
         <span class="logo">FILE ORGANIZER</span>
       </div>
       <h1>Organization Report</h1>
-      <div class="meta">Generated: {report['generated_at']} &nbsp;|&nbsp; Output: {report['output_directory']}</div>
+      <div class="meta">Generated: @@generated_at@@ &nbsp;|&nbsp; Output: @@output_directory@@</div>
     </header>
 
     <div class="stats-grid">
       <div class="stat-card">
         <div class="stat-label">Total Files</div>
-        <div class="stat-value">{summary['total_files']}</div>
+        <div class="stat-value">@@total_files@@</div>
       </div>
       <div class="stat-card">
         <div class="stat-label">Organized</div>
-        <div class="stat-value" style="color:var(--success)">{summary['files_organized']}</div>
+        <div class="stat-value" style="color:var(--success)">@@files_organized@@</div>
       </div>
       <div class="stat-card">
         <div class="stat-label">Failed</div>
-        <div class="stat-value" style="color:var(--danger)">{summary['files_failed']}</div>
+        <div class="stat-value" style="color:var(--danger)">@@files_failed@@</div>
       </div>
       <div class="stat-card">
         <div class="stat-label">Categories</div>
-        <div class="stat-value" style="color:var(--accent2)">{summary['total_categories']}</div>
+        <div class="stat-value" style="color:var(--accent2)">@@total_categories@@</div>
       </div>
       <div class="stat-card">
         <div class="stat-label">Largest File</div>
         <div class="stat-value" style="font-size:1.1rem">📦</div>
-        <div class="stat-sub">{summary['largest_file']}</div>
+        <div class="stat-sub">@@largest_file@@</div>
       </div>
       <div class="stat-card">
         <div class="stat-label">Top Extension</div>
-        <div class="stat-value" style="font-size:1.4rem; font-family:'Space Mono',monospace">{summary['most_common_extension']}</div>
+        <div class="stat-value" style="font-size:1.4rem; font-family:'Space Mono',monospace">@@most_common_extension@@</div>
       </div>
     </div>
 
@@ -244,10 +367,10 @@ def save_html_report(report: dict, output_dir: str) -> str:
         <thead>
           <tr><th>Category</th><th>Files</th><th>Size</th><th>Extensions</th></tr>
         </thead>
-        <tbody>{cat_rows}</tbody>
+        <tbody>@@cat_rows@@</tbody>
       </table>
     </div>
-
+@@file_pages@@
     <footer>File Organizer —  Project</footer>
   </div>
 
@@ -255,41 +378,180 @@ def save_html_report(report: dict, output_dir: str) -> str:
     const COLORS = ['#00e5ff','#7c4dff','#00e676','#ff5252','#ff9100','#e040fb',
                     '#69f0ae','#40c4ff','#ffd740','#ff6e40','#b9f6ca','#ea80fc'];
 
-    new Chart(document.getElementById('catChart'), {{
+    new Chart(document.getElementById('catChart'), {
       type: 'doughnut',
-      data: {{
-        labels: {json.dumps(cat_chart_labels)},
-        datasets: [{{ data: {json.dumps(cat_chart_data)}, backgroundColor: COLORS,
-                      borderColor: '#16161f', borderWidth: 3 }}]
-      }},
-      options: {{
+      data: {
+        labels: @@cat_chart_labels@@,
+        datasets: [{ data: @@cat_chart_data@@, backgroundColor: COLORS,
+                      borderColor: '#16161f', borderWidth: 3 }]
+      },
+      options: {
         responsive: true, maintainAspectRatio: false,
-        plugins: {{ legend: {{ position: 'right', labels: {{ color: '#e0e0f0', font: {{ size: 11 }}, boxWidth: 12 }} }} }}
-      }}
-    }});
+        plugins: { legend: { position: 'right', labels: { color: '#e0e0f0', font: { size: 11 }, boxWidth: 12 } } }
+      }
+    });
 
-    new Chart(document.getElementById('extChart'), {{
+    new Chart(document.getElementById('extChart'), {
       type: 'bar',
-      data: {{
-        labels: {json.dumps(ext_labels)},
-        datasets: [{{ data: {json.dumps(ext_data)}, backgroundColor: COLORS,
-                      borderRadius: 6 }}]
-      }},
-      options: {{
+      data: {
+        labels: @@ext_labels@@,
+        datasets: [{ data: @@ext_data@@, backgroundColor: COLORS,
+                      borderRadius: 6 }]
+      },
+      options: {
         responsive: true, maintainAspectRatio: false,
-        plugins: {{ legend: {{ display: false }} }},
-        scales: {{
-          x: {{ ticks: {{ color: '#6b6b8a', font: {{ family: 'Space Mono', size: 10 }} }},
-               grid: {{ color: '#1a1a2e' }} }},
-          y: {{ ticks: {{ color: '#6b6b8a' }}, grid: {{ color: '#1a1a2e' }} }}
-        }}
-      }}
-    }});
+        plugins: { legend: { display: false } },
+        scales: {
+          x: { ticks: { color: '#6b6b8a', font: { family: 'Space Mono', size: 10 } },
+               grid: { color: '#1a1a2e' } },
+          y: { ticks: { color: '#6b6b8a' }, grid: { color: '#1a1a2e' } }
+        }
+      }
+    });
   </script>
 </body>
-</html>"""
+</html>""")
+
+_FILES_PAGE_HTML = _compile_template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8"/>
+  <title>Smart File Organizer — Files @@page@@</title>
+  <style>
+    body { font-family: Arial, Helvetica, sans-serif; background: #0a0a0f; color: #e0e0f0; padding: 2rem; }
+    a { color: #00e5ff; }
+    nav { margin: 1rem 0; font-family: monospace; }
+    table { width: 100%; border-collapse: collapse; font-size: 0.8rem; }
+    th { text-align: left; color: #6b6b8a; border-bottom: 1px solid #2a2a3d; padding: 0.4rem; }
+    td { padding: 0.4rem; border-bottom: 1px solid rgba(42,42,61,0.5); word-break: break-all; }
+  </style>
+</head>
+<body>
+  <h1>Files — page @@page@@</h1>
+  <nav>@@nav@@</nav>
+  <table>
+    <thead><tr><th>Original</th><th>Destination</th><th>Category</th><th>Size</th><th>Status</th></tr></thead>
+    <tbody>@@rows@@</tbody>
+  </table>
+  <nav>@@nav@@</nav>
+</body>
+</html>""")
+
+
+def _category_rows(cats: dict) -> Iterator[str]:
+    for cat, data in sorted(cats.items(), key=lambda x: -x[1]["count"]):
+        icon = ICONS.get(cat, "📁")
+        mb = data["total_bytes"] / (1024 * 1024)
+        exts = ", ".join(data["extensions"][:6]) or "—"
+        yield f"""
+        <tr>
+          <td><span class="cat-icon">{icon}</span> {cat}</td>
+          <td><span class="badge">{data['count']}</span></td>
+          <td>{mb:.2f} MB</td>
+          <td class="ext-cell">{exts}</td>
+        </tr>"""
+
+
+def _file_rows(results: list[dict]) -> Iterator[str]:
+    for r in results:
+        yield (
+            f"<tr><td>{escape(r['original'])}</td><td>{escape(r['destination'])}</td>"
+            f"<td>{escape(r['category'])}</td><td>{r['size_bytes']}</td>"
+            f"<td>{escape(str(r['status']))}</td></tr>\n"
+        )
+
+
+def _page_name(page: int) -> str:
+    return f"page_{page:05d}.html"
+
+
+def save_file_pages(results: Iterable[dict], output_dir: str,
+                    page_size: int = FILES_PER_PAGE) -> int:
+    """
+    Writes the per-file results as linked HTML pages of page_size rows under
+    output_dir/organizer_report_files/. Holds one page in memory at a time.
+    Returns the number of pages written.
+    """
+    pages_dir = os.path.join(output_dir, FILES_DIRNAME)
+    os.makedirs(pages_dir, exist_ok=True)
+
+    def write(page: int, rows: list[dict], has_next: bool) -> None:
+        links = ['<a href="../organizer_report.html">Report</a>']
+        if page > 1:
+            links.append(f'<a href="{_page_name(page - 1)}">← Prev</a>')
+        if has_next:
+            links.append(f'<a href="{_page_name(page + 1)}">Next →</a>')
+        path = os.path.join(pages_dir, _page_name(page))
+        with open(path, "w", encoding="utf-8") as fh:
+            _render(_FILES_PAGE_HTML, {
+                "page": str(page),
+                "nav": " &nbsp;|&nbsp; ".join(links),
+                "rows": _file_rows(rows),
+            }, fh)
+
+    it = iter(results)
+    page = 0
+    pending = list(islice(it, page_size))
+    while pending:
+        page += 1
+        following = list(islice(it, page_size))
+        write(page, pending, bool(following))
+        pending = following
+    return page
+
+
+def save_html_report(report: dict, output_dir: str,
+                     results: Iterable[dict] | None = None,
+                     page_size: int = FILES_PER_PAGE) -> str:
+    """
+    Generates a slick HTML dashboard.
+    If results are given, a paginated per-file table is written alongside
+    it (see save_file_pages) and linked from the dashboard.
+    """
+
+    cats = report["categories"]
+    ext_breakdown = report["extension_breakdown"]
+    summary = report["summary"]
+
+    ordered = sorted(cats.items(), key=lambda x: -x[1]["count"])
+    cat_chart_labels = [cat for cat, _ in ordered]
+    cat_chart_data = [data["count"] for _, data in ordered]
+
+    # Extension breakdown (top 10)
+    top_exts = sorted(ext_breakdown.items(), key=lambda x: -x[1])[:10]
+    ext_labels = [e[0] or "no-ext" for e in top_exts]
+    ext_data = [e[1] for e in top_exts]
+
+    file_pages = ""
+    if results is not None:
+        pages = save_file_pages(results, output_dir, page_size)
+        if pages:
+            file_pages = f"""
+    <div class="card" style="margin-top:1.5rem">
+      <h2>Files</h2>
+      <a href="{FILES_DIRNAME}/{_page_name(1)}" style="color:var(--accent)">Browse all files</a>
+      <span class="ext-cell">&nbsp; {pages} page{'s' if pages != 1 else ''} of up to {page_size}</span>
+    </div>
+"""
+
+    values = {
+        "generated_at": report["generated_at"],
+        "output_directory": report["output_directory"],
+        "total_files": str(summary["total_files"]),
+        "files_organized": str(summary["files_organized"]),
+        "files_failed": str(summary["files_failed"]),
+        "total_categories": str(summary["total_categories"]),
+        "largest_file": summary["largest_file"],
+        "most_common_extension": summary["most_common_extension"],
+        "cat_rows": _category_rows(cats),
+        "cat_chart_labels": json.dumps(cat_chart_labels),
+        "cat_chart_data": json.dumps(cat_chart_data),
+        "ext_labels": json.dumps(ext_labels),
+        "ext_data": json.dumps(ext_data),
+        "file_pages": file_pages,
+    }
 
     path = os.path.join(output_dir, "organizer_report.html")
     with open(path, "w", encoding="utf-8") as f:
-        f.write(html)
-    return path
\ No newline at end of file
+        _render(_REPORT_HTML, values, f)
+    return path
@@ -0,0 +1,250 @@
+"""
+rules.py — User classification rules loaded from a TOML or JSON file.
+
+Rules are tried in file order before the built-in keyword and extension
+rules; the first rule whose conditions all hold decides the category.
+
+    # rules.toml
+    [[rules]]
+    category = "RAW Photos"
+    extensions = [".cr2", ".nef", ".arw"]
+
+    [[rules]]
+    category = "Old Downloads"
+    path_prefix = "~/Downloads"
+    min_age_days = 180
+
+    [[rules]]
+    category = "Recordings"
+    extensions = ".mp4"
+    name = "^zoom_|meeting"       # regex, searched in the lowercased name
+    min_size = "50MB"              # bytes, or a number with KB / MB / GB
+
+(The JSON form is {"rules": [{...}, ...]}. A relative path_prefix is relative
+to the rules file's folder.)
+
+At load time the rules are compiled into an extension index: each
+extension maps to the ordered list of rules that can apply to it (its own
+rules plus rules without an extension condition), so a file is only
+checked against its bucket. Within a bucket, cheap size / age / path checks
+run before the regex. The compiled table is cached as JSON next to other
+caches in the output folder, keyed by a hash of the rules file (JSON, not
+pickle: loading a pickle from a shared folder could run anyone's code).
+"""
+
+import hashlib
+import json
+import os
+import re
+from datetime import date
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    tomllib = None
+
+RULES_CACHE_FILENAME = ".organizer_rules_cache.json"
+_TABLE_VERSION = 2  # Bump when the compiled table layout changes
+
+_SIZE_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4}
+_SIZE = re.compile(r"^\s*([\d.]+)\s*([KMGT]?B?)\s*$", re.IGNORECASE)
+_FIELDS = {"category", "extensions", "name", "min_size", "max_size",
+           "min_age_days", "max_age_days", "path_prefix"}
+
+
+def parse_size(value) -> int:
+    """Bytes from an int or a string like "50MB" / "1.5 GB" (1024-based)."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    m = _SIZE.match(str(value))
+    if m is None:
+        raise ValueError(f"bad size {value!r}")
+    return int(float(m.group(1)) * _SIZE_UNITS[m.group(2).upper()])
+
+
+def _as_list(value) -> list:
+    return [value] if isinstance(value, str) else list(value)
+
+
+def _normalize(raw: dict, index: int) -> dict:
+    """Validates one rule and converts it to plain, comparable values."""
+    where = f"rule {index + 1}"
+    unknown = set(raw) - _FIELDS
+    if unknown:
+        raise ValueError(f"{where}: unknown field(s) {', '.join(sorted(unknown))}")
+    if not raw.get("category"):
+        raise ValueError(f"{where}: 'category' is required")
+
+    rule = {"category": str(raw["category"])}
+    if "extensions" in raw:
+        rule["extensions"] = sorted({
+            (e if e.startswith(".") or not e else f".{e}").lower()
+            for e in _as_list(raw["extensions"])
+        })
+    if "name" in raw:
+        try:
+            re.compile(raw["name"])
+        except re.error as e:
+            raise ValueError(f"{where}: bad name regex: {e}") from None
+        rule["name"] = raw["name"]
+    for key in ("min_size", "max_size"):
+        if key in raw:
+            try:
+                rule[key] = parse_size(raw[key])
+            except ValueError as e:
+                raise ValueError(f"{where}: {e}") from None
+    for key in ("min_age_days", "max_age_days"):
+        if key in raw:
+            rule[key] = int(raw[key])
+    if "path_prefix" in raw:
+        # Kept as written: RuleSet resolves it, so the cached table is cwd-independent
+        rule["path_prefix"] = [str(p) for p in _as_list(raw["path_prefix"])]
+    return rule
+
+
+def _resolve_prefixes(rules: list[dict], base: str) -> list[dict]:
+    """Rules with path_prefix made absolute (~ expanded, relative to base)."""
+    resolved = []
+    for rule in rules:
+        if "path_prefix" in rule:
+            rule = dict(rule, path_prefix=tuple(
+                os.path.abspath(os.path.join(base, os.path.expanduser(p)))
+                for p in rule["path_prefix"]
+            ))
+        resolved.append(rule)
+    return resolved
+
+
+def _compile_table(rules: list[dict]) -> dict:
+    """Extension index over rule positions: {ext: [i, …]} plus the catch-all list."""
+    wildcard = [i for i, r in enumerate(rules) if "extensions" not in r]
+    by_ext: dict[str, list[int]] = {}
+    for i, rule in enumerate(rules):
+        for ext in rule.get("extensions", ()):
+            by_ext.setdefault(ext, []).append(i)
+    # Every bucket keeps file order once the catch-all rules are merged in
+    index = {ext: sorted(set(ids) | set(wildcard)) for ext, ids in by_ext.items()}
+    return {"version": _TABLE_VERSION, "rules": rules, "index": index, "wildcard": wildcard}
+
+
+class _Bucket:
+    """The rules that can apply to one extension, in priority order."""
+
+    __slots__ = ("rules", "_checks")
+
+    def __init__(self, rules: list[dict]):
+        self.rules = rules
+        self._checks = None  # Regexes compiled on first use: most buckets never are
+
+    def match(self, f: dict, name_lower: str, ages: dict, today: date) -> str | None:
+        if not self.rules:
+            return None
+        checks = self._checks
+        if checks is None:
+            checks = self._checks = [
+                (r, re.compile(r["name"]) if "name" in r else None) for r in self.rules
+            ]
+
+        size = f["size_bytes"]
+        path = None
+        for rule, regex in checks:
+            if "min_size" in rule and size < rule["min_size"]:
+                continue
+            if "max_size" in rule and size > rule["max_size"]:
+                continue
+            if "min_age_days" in rule or "max_age_days" in rule:
+                modified = f.get("modified", "")
+                age = ages.get(modified)
+                if age is None:
+                    try:
+                        age = (today - date.fromisoformat(modified)).days
+                    except ValueError:
+                        age = 0
+                    ages[modified] = age
+                if age < rule.get("min_age_days", age) or age > rule.get("max_age_days", age):
+                    continue
+            if "path_prefix" in rule:
+                path = path or os.path.abspath(f["path"])
+                if not any(path == p or path.startswith(p + os.sep) for p in rule["path_prefix"]):
+                    continue
+            if regex is not None and regex.search(name_lower) is None:
+                continue
+            return rule["category"]
+        return None
+
+
+class RuleSet:
+    """
+    Compiled rules. match(file_info) returns a category or None (meaning:
+    fall through to the built-in rules). Use RuleSet.load() for files.
+    Relative path_prefix values resolve against base: the rules file's
+    folder for load(), the current directory otherwise.
+    """
+
+    def __init__(self, table: dict, key: str = "", base: str | None = None):
+        base = os.path.abspath(base or os.getcwd())
+        rules = _resolve_prefixes(table["rules"], base)
+        self.key = key
+        self.base = base
+        self.count = len(rules)
+        self.uses_age = any("min_age_days" in r or "max_age_days" in r for r in rules)
+        self.uses_path = any("path_prefix" in r for r in rules)
+        self._buckets = {
+            ext: _Bucket([rules[i] for i in ids]) for ext, ids in table["index"].items()
+        }
+        self._wildcard = _Bucket([rules[i] for i in table["wildcard"]])
+        self._ages: dict[str, int] = {}
+        self._today = date.today()
+
+    @classmethod
+    def from_rules(cls, rules: list[dict], key: str = "") -> "RuleSet":
+        """Compiles a list of rule dicts (same fields as the file format)."""
+        return cls(_compile_table([_normalize(r, i) for i, r in enumerate(rules)]), key)
+
+    @classmethod
+    def load(cls, path: str, cache_dir: str | None = None) -> "RuleSet":
+        """
+        Loads a .toml or .json rules file. With cache_dir, the compiled
+        table is reused from there while the file's contents are unchanged.
+        """
+        with open(path, "rb") as fh:
+            data = fh.read()
+        base = os.path.dirname(os.path.abspath(path))
+        key = hashlib.sha1(data + str(_TABLE_VERSION).encode()).hexdigest()
+
+        cache_path = os.path.join(cache_dir, RULES_CACHE_FILENAME) if cache_dir else None
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "rb") as fh:
+                    cached = json.load(fh)
+                if cached.get("key") == key:
+                    return cls(cached["table"], key, base)
+            except (OSError, ValueError, AttributeError, KeyError, IndexError, TypeError):
+                pass  # Stale or damaged: rebuild below
+
+        if path.lower().endswith(".toml"):
+            if tomllib is None:
+                raise ValueError("TOML rules need Python 3.11+; use a .json rules file")
+            config = tomllib.loads(data.decode("utf-8"))
+        else:
+            config = json.loads(data)
+        raw_rules = config.get("rules", []) if isinstance(config, dict) else config
+        table = _compile_table([_normalize(r, i) for i, r in enumerate(raw_rules)])
+
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = cache_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump({"key": key, "table": table}, fh, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, cache_path)
+        return cls(table, key, base)
+
+    @property
+    def fingerprint(self) -> str:
+        """Changes with the rules and their base, and daily if any rule depends on age."""
+        key = f"{self.key}:{self.base}" if self.uses_path else self.key
+        return f"{key}:{self._today}" if self.uses_age else key
+
+    def match(self, f: dict) -> str | None:
+        bucket = self._buckets.get(f["extension"], self._wildcard)
+        return bucket.match(f, f["name"].lower(), self._ages, self._today)
@@ -0,0 +1,219 @@
+"""
+scan_index.py — Persistent incremental scan index (SQLite in the output folder).
+
+Each directory is stored with its mtime and the list of its subdirectories,
+and each file with its size, mtime and category. On later runs a directory
+whose mtime is unchanged is not listed again: its files come straight from
+the index, and only new or changed files are classified.
+
+Note: editing a file in place does not change its directory's mtime, so
+such edits are only picked up once the directory itself changes.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from collections import defaultdict
+from typing import Iterable
+
+from classifier import EXTENSION_MAP, KEYWORD_PATTERNS, classify_all, rules_fingerprint
+from records import FileRecord
+
+INDEX_FILENAME = ".organizer_index.sqlite"
+
+# A directory modified this recently may change again within the same mtime
+# tick, so it is never trusted on the next run (same idea as git's racy check).
+RACY_WINDOW_NS = 2_000_000_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta  (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS dirs  (path TEXT PRIMARY KEY, mtime_ns INTEGER, subdirs TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    dir TEXT, name TEXT, extension TEXT, size_bytes INTEGER,
+    mtime_ns INTEGER, modified TEXT, category TEXT,
+    PRIMARY KEY (dir, name)
+);
+"""
+
+
+def _rules_fingerprint() -> str:
+    """Changes whenever the classification rules change."""
+    rules = repr((sorted(EXTENSION_MAP.items()), KEYWORD_PATTERNS, rules_fingerprint()))
+    return hashlib.sha1(rules.encode("utf-8")).hexdigest()
+
+
+def _make_record(directory: str, name: str, extension: str, size: int,
+                 modified: str, category: str, compact: bool) -> dict:
+    path = os.path.join(directory, name)
+    if compact:
+        rec = FileRecord(name, path, extension, size, modified)
+        rec["category"] = category
+        return rec
+    return {
+        "name": name,
+        "path": path,
+        "extension": extension,
+        "size_bytes": size,
+        "modified": modified,
+        "category": category,
+    }
+
+
+class ScanIndex:
+    """
+    Usage:
+        with ScanIndex(output_dir) as index:
+            files = index.scan(source_dir)   # already classified
+    """
+
+    def __init__(self, output_dir: str):
+        os.makedirs(output_dir, exist_ok=True)
+        self.path = os.path.join(output_dir, INDEX_FILENAME)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(_SCHEMA)
+        self._check_rules()
+
+    def __enter__(self) -> "ScanIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _check_rules(self) -> None:
+        """Drops cached entries if they were classified with other rules."""
+        fingerprint = _rules_fingerprint()
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'rules'"
+        ).fetchone()
+        if row and row[0] == fingerprint:
+            return
+        with self._conn:
+            self._conn.execute("DELETE FROM dirs")
+            self._conn.execute("DELETE FROM files")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('rules', ?)", (fingerprint,)
+            )
+
+    def scan(self, root: str, compact: bool = False,
+             exclude: Iterable[str] = ()) -> list[dict]:
+        """
+        Scans root incrementally and returns classified file records
+        (the same fields as scanner.scan_directory plus 'category').
+        Directories in exclude (e.g. the output folder) are skipped.
+        """
+        if not os.path.isdir(root):
+            raise ValueError(f"Path does not exist or is not a directory: {root}")
+
+        started_ns = time.time_ns()
+        cached_dirs = {
+            path: (mtime_ns, subdirs.split("\0") if subdirs else [])
+            for path, mtime_ns, subdirs in self._conn.execute(
+                "SELECT path, mtime_ns, subdirs FROM dirs"
+            )
+        }
+        cached_files: dict[str, dict[str, tuple]] = defaultdict(dict)
+        for row in self._conn.execute(
+            "SELECT dir, name, extension, size_bytes, mtime_ns, modified, category FROM files"
+        ):
+            cached_files[row[0]][row[1]] = row[2:]
+
+        files: list[dict] = []
+        unclassified: list[dict] = []
+        changed: list[tuple[str, int, list[str], list[tuple]]] = []
+        visited: set[str] = set()
+        excluded = {os.path.abspath(p) for p in exclude}
+
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                dir_mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            visited.add(directory)
+
+            cached = cached_dirs.get(directory)
+            if cached is not None and cached[0] == dir_mtime:
+                subdirs = cached[1]
+                for name, (ext, size, _, modified, category) in cached_files[directory].items():
+                    files.append(_make_record(directory, name, ext, size, modified, category, compact))
+            else:
+                subdirs, rows = self._rescan_directory(
+                    directory, cached_files[directory], files, unclassified, compact
+                )
+                if dir_mtime >= started_ns - RACY_WINDOW_NS:
+                    dir_mtime = -1  # Too fresh to trust next time
+                changed.append((directory, dir_mtime, subdirs, rows))
+
+            stack.extend(
+                path for path in (os.path.join(directory, sub) for sub in reversed(subdirs))
+                if not excluded or os.path.abspath(path) not in excluded
+            )
+
+        classify_all(unclassified)
+        self._save(root, changed, visited, cached_dirs)
+        return files
+
+    def _rescan_directory(self, directory: str, previous: dict[str, tuple],
+                          files: list, unclassified: list,
+                          compact: bool) -> tuple[list[str], list[dict]]:
+        """Lists a changed directory, reusing categories of unchanged files."""
+        subdirs: list[str] = []
+        rows: list[dict] = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                            continue
+                        if entry.is_dir() or entry.name.startswith(INDEX_FILENAME):
+                            continue
+                        stat = entry.stat()
+                    except OSError:
+                        continue  # Skip inaccessible files
+
+                    ext = os.path.splitext(entry.name)[1].lower()
+                    modified = time.strftime("%Y-%m-%d", time.localtime(stat.st_mtime))
+                    prior = previous.get(entry.name)
+                    category = None
+                    if prior and prior[1] == stat.st_size and prior[2] == stat.st_mtime_ns:
+                        category = prior[4]
+                    rec = _make_record(directory, entry.name, ext, stat.st_size,
+                                       modified, category, compact)
+                    files.append(rec)
+                    if category is None:
+                        unclassified.append(rec)
+                    rows.append((rec, stat.st_mtime_ns))
+        except OSError:
+            pass  # Skip unreadable directories
+        return subdirs, rows
+
+    def _save(self, root: str, changed: list, visited: set[str],
+              cached_dirs: dict) -> None:
+        prefix = os.path.join(root, "")
+        stale = [
+            (path,) for path in cached_dirs
+            if path not in visited and (path == root or path.startswith(prefix))
+        ]
+        with self._conn:
+            self._conn.executemany("DELETE FROM dirs WHERE path = ?", stale)
+            self._conn.executemany("DELETE FROM files WHERE dir = ?", stale)
+            for directory, mtime_ns, subdirs, rows in changed:
+                self._conn.execute("DELETE FROM files WHERE dir = ?", (directory,))
+                self._conn.executemany(
+                    "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (directory, rec["name"], rec["extension"], rec["size_bytes"],
+                         mtime_ns, rec["modified"], rec["category"])
+                        for rec, mtime_ns in rows
+                    ),
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)",
+                    (directory, mtime_ns, "\0".join(subdirs)),
+                )
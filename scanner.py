@@ -3,35 +3,192 @@ scanner.py — Scans a directory and returns file metadata.
 """
 
 import os
+import queue
+import threading
 import time
+from typing import Callable, Iterable, Iterator
 
+import metrics
+from records import FileRecord
 
-def scan_directory(path: str) -> list[dict]:
+SCAN_WORKERS = 8         # Directory listings in flight at once
+SCAN_QUEUE_DEPTH = 1024  # Max directories waiting in the shared queue
+
+
+def _entry_record(entry: os.DirEntry) -> dict:
+    """Builds a file info dict from a DirEntry, reusing its cached stat."""
+    stat = entry.stat()
+    return {
+        "name": entry.name,
+        "path": entry.path,
+        "extension": os.path.splitext(entry.name)[1].lower(),
+        "size_bytes": stat.st_size,
+        "modified": time.strftime(
+            "%Y-%m-%d", time.localtime(stat.st_mtime)
+        ),
+    }
+
+
+def path_record(path: str) -> dict:
+    """File info dict for a single path (same fields as scan_directory)."""
+    stat = os.stat(path)
+    name = os.path.basename(path)
+    return {
+        "name": name,
+        "path": path,
+        "extension": os.path.splitext(name)[1].lower(),
+        "size_bytes": stat.st_size,
+        "modified": time.strftime(
+            "%Y-%m-%d", time.localtime(stat.st_mtime)
+        ),
+    }
+
+
+def _entry_file_record(entry: os.DirEntry) -> FileRecord:
+    """Compact (__slots__) variant of _entry_record."""
+    stat = entry.stat()
+    return FileRecord(
+        entry.name,
+        entry.path,
+        os.path.splitext(entry.name)[1].lower(),
+        stat.st_size,
+        time.strftime("%Y-%m-%d", time.localtime(stat.st_mtime)),
+    )
+
+
+def _list_directory(
+    path: str,
+    subdirs: list[str],
+    files: list,
+    make_record: Callable[[os.DirEntry], dict] = _entry_record,
+) -> None:
+    """Lists one directory, appending file records and subdirectory paths."""
+    found = len(files)
+    errors = 0
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif not entry.is_dir():
+                        files.append(make_record(entry))
+                except OSError:  # Permissions, vanished files, ELOOP, EIO, …
+                    errors += 1
+                    continue  # Skip only this entry, not the rest of the directory
+    except OSError:
+        errors += 1  # Skip unreadable directories
+    if metrics.ENABLED:
+        new = files[found:]
+        metrics.syscall("scandir")
+        metrics.syscall("stat", len(new))
+        metrics.add("scan", files=len(new), errors=errors,
+                    bytes=sum(f["size_bytes"] for f in new))
+
+
+def iter_directory(path: str, compact: bool = False,
+                   exclude: Iterable[str] = ()) -> Iterator[dict]:
     """
-    Recursively scan a directory.
-    Returns a list of file info dicts.
+    Recursively scan a directory with os.scandir.
+    Yields file info dicts one at a time so later stages can start early.
+    With compact=True yields FileRecord objects instead of dicts.
+    Directories listed in exclude (e.g. an output folder inside the source)
+    are not descended into.
     """
     if not os.path.isdir(path):
         raise ValueError(f"Path does not exist or is not a directory: {path}")
 
-    files = []
-    for root, _, filenames in os.walk(path):
-        for name in filenames:
-            full_path = os.path.join(root, name)
-            try:
-                stat = os.stat(full_path)
-                files.append({
-                    "name": name,
-                    "path": full_path,
-                    "extension": os.path.splitext(name)[1].lower(),
-                    "size_bytes": stat.st_size,
-                    "modified": time.strftime(
-                        "%Y-%m-%d", time.localtime(stat.st_mtime)
-                    ),
-                })
-            except (PermissionError, FileNotFoundError):
-                continue  # Skip inaccessible files
+    make_record = _entry_file_record if compact else _entry_record
+    excluded = {os.path.abspath(p) for p in exclude}
+    stack = [path]
+    while stack:
+        subdirs: list[str] = []
+        files: list[dict] = []
+        _list_directory(stack.pop(), subdirs, files, make_record)
+        yield from files
+        if excluded:
+            subdirs = [d for d in subdirs if os.path.abspath(d) not in excluded]
+        # Reverse so subdirectories are visited in listing order
+        stack.extend(reversed(subdirs))
+
+
+def scan_directory(path: str, compact: bool = False,
+                   exclude: Iterable[str] = ()) -> list[dict]:
+    """
+    Recursively scan a directory.
+    Returns a list of file info dicts (FileRecords when compact=True).
+    Directories in exclude are skipped, as in iter_directory.
+    """
+    return list(iter_directory(path, compact, exclude))
+
+
+def scan_directory_parallel(
+    paths: str | Iterable[str],
+    workers: int = SCAN_WORKERS,
+    max_queue: int = SCAN_QUEUE_DEPTH,
+    ordered: bool = False,
+    compact: bool = False,
+    exclude: Iterable[str] = (),
+) -> list[dict]:
+    """
+    Scans one or more directory trees with a pool of threads.
+    Workers take directories from a shared bounded queue; when the queue is
+    full a worker lists the overflow itself instead of blocking.
+    Returns the same records as scan_directory. With ordered=True the
+    result is sorted by path so runs are reproducible. compact=True
+    returns FileRecords instead of dicts. Directories in exclude are skipped.
+    """
+    roots = [paths] if isinstance(paths, str) else list(paths)
+    for root in roots:
+        if not os.path.isdir(root):
+            raise ValueError(f"Path does not exist or is not a directory: {root}")
+
+    work: queue.Queue = queue.Queue(maxsize=max(max_queue, 1))
+    results: list[list[dict]] = []
+    results_lock = threading.Lock()
+    make_record = _entry_file_record if compact else _entry_record
+    excluded = {os.path.abspath(p) for p in exclude}
+
+    def worker() -> None:
+        found: list[dict] = []
+        with results_lock:
+            results.append(found)
+        while True:
+            path = work.get()
+            if path is None:
+                work.task_done()
+                return
+            local = [path]
+            while local:
+                subdirs: list[str] = []
+                _list_directory(local.pop(), subdirs, found, make_record)
+                if excluded:
+                    subdirs = [d for d in subdirs if os.path.abspath(d) not in excluded]
+                for sub in subdirs:
+                    try:
+                        work.put_nowait(sub)
+                    except queue.Full:
+                        local.append(sub)  # Queue is full: walk it ourselves
+            work.task_done()
+
+    threads = [
+        threading.Thread(target=worker, daemon=True)
+        for _ in range(max(workers, 1))
+    ]
+    for t in threads:
+        t.start()
+
+    for root in roots:
+        work.put(root)
+    work.join()
+    for _ in threads:
+        work.put(None)
+    for t in threads:
+        t.join()
 
+    files = [f for found in results for f in found]
+    if ordered:
+        files.sort(key=lambda f: f["path"])
     return files
 
 
@@ -40,4 +197,4 @@ def human_readable_size(size_bytes: int) -> str:
         if size_bytes < 1024:
             return f"{size_bytes:.1f} {unit}"
         size_bytes /= 1024
-    return f"{size_bytes:.1f} TB"
\ No newline at end of file
+    return f"{size_bytes:.1f} TB"
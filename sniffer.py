@@ -0,0 +1,186 @@
+"""
+sniffer.py — Content-based classification for files the extension can't place.
+
+Only files that came out of classify_file as "Miscellaneous" with an
+extension missing from EXTENSION_MAP are opened. For those, the first
+HEADER_BYTES bytes are matched against magic numbers stored in one byte
+trie per offset. Results are cached by (device, inode, mtime, size) in a
+bounded LRU that is saved in the output folder, so later runs only stat.
+
+    with ContentSniffer(out) as sniffer:
+        sniffer.refine(files)        # after classify_all
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+from classifier import EXTENSION_MAP
+
+CACHE_FILENAME = ".organizer_sniff_cache.json"
+CACHE_ENTRIES = 100_000  # Oldest results are dropped past this
+HEADER_BYTES = 512       # Enough for the tar magic at offset 257
+SNIFF_WORKERS = 8
+
+# (offset, magic, category). Longer matches at the same offset win.
+SIGNATURES = [
+    # Documents
+    (0, b"%PDF-", "Documents"),
+    (0, b"{\\rtf", "Documents"),
+    (0, b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "Documents"),  # OLE2: .doc/.xls/.ppt
+    # Images
+    (0, b"\x89PNG\r\n\x1a\n", "Images"),
+    (0, b"\xff\xd8\xff", "Images"),
+    (0, b"GIF87a", "Images"),
+    (0, b"GIF89a", "Images"),
+    (0, b"\x00\x00\x01\x00", "Images"),  # .ico
+    (8, b"WEBP", "Images"),              # RIFF....WEBP
+    # Videos
+    (4, b"ftyp", "Videos"),              # MP4 / MOV / 3GP
+    (8, b"AVI ", "Videos"),
+    (0, b"\x1aE\xdf\xa3", "Videos"),     # Matroska / WebM
+    (0, b"FLV\x01", "Videos"),
+    # Audio
+    (4, b"ftypM4A", "Audio"),
+    (0, b"ID3", "Audio"),
+    (0, b"\xff\xfb", "Audio"),           # MPEG layer III frame
+    (0, b"fLaC", "Audio"),
+    (0, b"OggS", "Audio"),
+    (8, b"WAVE", "Audio"),
+    # Archives
+    (0, b"PK\x03\x04", "Archives"),
+    (0, b"\x1f\x8b", "Archives"),
+    (0, b"Rar!\x1a\x07", "Archives"),
+    (0, b"7z\xbc\xaf\x27\x1c", "Archives"),
+    (0, b"BZh", "Archives"),
+    (0, b"\xfd7zXZ\x00", "Archives"),
+    (257, b"ustar", "Archives"),
+    # Executables
+    (0, b"\x7fELF", "Executables"),
+    (0, b"MZ", "Executables"),
+    (0, b"\xcf\xfa\xed\xfe", "Executables"),  # Mach-O 64-bit
+    (0, b"\xce\xfa\xed\xfe", "Executables"),  # Mach-O 32-bit
+    # Code
+    (0, b"#!", "Code"),
+    (0, b"<?xml", "Code"),
+]
+
+
+def _build_tries(signatures) -> list[tuple[int, dict]]:
+    """One trie per offset: {byte: child, None: category}, offsets ascending."""
+    tries: dict[int, dict] = {}
+    for offset, magic, category in signatures:
+        node = tries.setdefault(offset, {})
+        for byte in magic:
+            node = node.setdefault(byte, {})
+        node[None] = category
+    return sorted(tries.items())
+
+
+_TRIES = _build_tries(SIGNATURES)
+
+
+def sniff_header(header: bytes) -> str | None:
+    """Category for the first bytes of a file, or None if nothing matches."""
+    for offset, node in _TRIES:
+        found = None
+        for byte in header[offset:]:
+            node = node.get(byte)
+            if node is None:
+                break
+            found = node.get(None, found)
+        if found is not None:
+            return found
+    return None
+
+
+def needs_sniffing(f: dict) -> bool:
+    """True for files the name and extension alone left unresolved."""
+    return f.get("category") == "Miscellaneous" and f["extension"] not in EXTENSION_MAP
+
+
+class ContentSniffer:
+    """
+    Reads headers in a thread pool and keeps a bounded, persisted LRU of
+    results. cache_dir=None keeps the cache in memory only.
+    """
+
+    def __init__(self, cache_dir: str | None = None, max_entries: int = CACHE_ENTRIES,
+                 workers: int = SNIFF_WORKERS):
+        self.path = os.path.join(cache_dir, CACHE_FILENAME) if cache_dir else None
+        self.max_entries = max_entries
+        self.workers = workers
+        self.hits = 0
+        self.reads = 0
+        self._cache: OrderedDict[str, str | None] = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, encoding="utf-8") as fh:
+                    self._cache.update(json.load(fh))
+            except (OSError, ValueError):
+                pass  # Unreadable cache: start over
+
+    def sniff(self, path: str) -> str | None:
+        """Category from the file's content, or None. Thread-safe."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = f"{st.st_dev}:{st.st_ino}:{st.st_mtime_ns}:{st.st_size}"
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+
+        try:
+            with open(path, "rb") as fh:
+                category = sniff_header(fh.read(HEADER_BYTES))
+        except OSError:
+            return None
+
+        with self._lock:
+            self.reads += 1
+            self._cache[key] = category
+            self._dirty = True
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return category
+
+    def refine(self, files: Iterable[dict]) -> int:
+        """
+        Sniffs every unresolved file in parallel and updates its category
+        in place. Returns how many files got a category.
+        """
+        pending = [f for f in files if needs_sniffing(f)]
+        if not pending:
+            return 0
+        changed = 0
+        with ThreadPoolExecutor(max_workers=max(self.workers, 1)) as pool:
+            for f, category in zip(pending, pool.map(lambda f: self.sniff(f["path"]), pending)):
+                if category is not None:
+                    f["category"] = category
+                    changed += 1
+        return changed
+
+    def save(self) -> None:
+        if not (self.path and self._dirty):
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with self._lock:
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(self._cache, fh, separators=(",", ":"))
+            self._dirty = False
+        os.replace(tmp, self.path)
+
+    def __enter__(self) -> "ContentSniffer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.save()
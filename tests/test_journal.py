@@ -0,0 +1,42 @@
+"""
+test_journal.py — Journaled moves can be undone from any working directory.
+
+Run from the project root:  python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from journal import MoveJournal, read_journal, undo_moves  # noqa: E402
+from organizer import organize_files  # noqa: E402
+
+
+def test_undo_from_another_cwd(tmp_path, monkeypatch):
+    work = tmp_path / "work"
+    (work / "src").mkdir(parents=True)
+    for i in range(3):
+        (work / "src" / f"note{i}.txt").write_text(f"note {i}")
+
+    # Relative source and output, as in "python -m cli src -o out"
+    monkeypatch.chdir(work)
+    files = [{
+        "name": f"note{i}.txt", "path": os.path.join("src", f"note{i}.txt"),
+        "category": "Documents", "size_bytes": 6,
+    } for i in range(3)]
+    with MoveJournal("out") as journal:
+        results = organize_files(files, "out", journal=journal)
+    assert [r["status"] for r in results] == ["success"] * 3
+
+    plans, _, _ = read_journal("out")
+    assert all(os.path.isabs(p["src"]) and os.path.isabs(p["dst"]) for p in plans.values())
+
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    monkeypatch.chdir(elsewhere)
+    undone = undo_moves(str(work / "out"))
+
+    assert [r["status"] for r in undone] == ["undone"] * 3
+    assert sorted(os.listdir(work / "src")) == ["note0.txt", "note1.txt", "note2.txt"]
+    assert os.listdir(elsewhere) == []  # No stray folders from relative paths
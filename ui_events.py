@@ -0,0 +1,88 @@
+"""
+ui_events.py — Thread-safe, throttled channel from worker threads to the Tk UI.
+
+Workers post log lines, progress values, status text or arbitrary calls;
+the Tk main loop drains everything every DRAIN_INTERVAL_MS via after().
+Log lines are delivered in batches, and progress / status are
+latest-value-wins, so a 100k-file run causes at most ~30 UI updates/sec.
+"""
+
+import queue
+import threading
+from typing import Callable
+
+DRAIN_INTERVAL_MS = 33        # ~30 Hz
+MAX_LINES_PER_DRAIN = 500     # Older lines in a burst are summarized
+
+
+class UIEventBus:
+    def __init__(
+        self,
+        root,
+        on_log: Callable[[list[tuple[str, str]]], None],
+        on_progress: Callable[[float], None],
+        on_status: Callable[[str], None],
+        interval_ms: int = DRAIN_INTERVAL_MS,
+    ):
+        self._root = root
+        self._on_log = on_log
+        self._on_progress = on_progress
+        self._on_status = on_status
+        self._interval_ms = interval_ms
+
+        self._lines: queue.SimpleQueue = queue.SimpleQueue()
+        self._calls: queue.SimpleQueue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._progress: float | None = None
+        self._status: str | None = None
+
+    # ── Worker side (any thread) ──────────────────────
+    def log(self, line: str, tag: str = "info") -> None:
+        self._lines.put((line, tag))
+
+    def progress(self, value: float) -> None:
+        with self._lock:
+            self._progress = value
+
+    def status(self, text: str) -> None:
+        with self._lock:
+            self._status = text
+
+    def call(self, fn: Callable, *args, **kwargs) -> None:
+        """Runs fn(*args, **kwargs) on the Tk main thread."""
+        self._calls.put((fn, args, kwargs))
+
+    # ── Main-loop side ────────────────────────────────
+    def start(self) -> None:
+        self._root.after(self._interval_ms, self._drain)
+
+    def _drain(self) -> None:
+        try:
+            lines = []
+            while True:
+                try:
+                    lines.append(self._lines.get_nowait())
+                except queue.Empty:
+                    break
+            if len(lines) > MAX_LINES_PER_DRAIN:
+                skipped = len(lines) - MAX_LINES_PER_DRAIN
+                lines = [(f"… {skipped} more lines …\n", "warn")] + lines[-MAX_LINES_PER_DRAIN:]
+            if lines:
+                self._on_log(lines)
+
+            with self._lock:
+                progress, self._progress = self._progress, None
+                status, self._status = self._status, None
+            if progress is not None:
+                self._on_progress(progress)
+            if status is not None:
+                self._on_status(status)
+
+            while True:
+                try:
+                    fn, args, kwargs = self._calls.get_nowait()
+                except queue.Empty:
+                    break
+                fn(*args, **kwargs)
+        finally:
+            self._root.after(self._interval_ms, self._drain)
@@ -0,0 +1,368 @@
+"""
+watcher.py — Organizes new files as they appear, without rescanning.
+
+Linux uses inotify (through ctypes, no extra dependency); elsewhere, or if
+inotify can't be set up, a poller re-lists only directories whose mtime
+changed. Either way only created or moved-in files are touched, so the
+steady-state cost follows the rate of new files, not the size of the tree.
+
+    Watcher("~/Downloads", "organized").run()          # until Ctrl+C
+
+A file is moved once it has been quiet for settle_seconds (or was closed
+after writing) and two stats a batch window apart agree on its size and
+mtime. Files that become ready together are moved as one batch.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+
+from classifier import classify_file
+from organizer import MAX_WORKERS, _MovePlanner, _move_single
+from renamer import generate_name
+from scanner import path_record
+
+logger = logging.getLogger("smart_organizer")
+
+SETTLE_SECONDS = 2.0   # Quiet time before a file that is still open is moved
+BATCH_SECONDS = 0.5    # Window for collecting a burst into one batch
+POLL_INTERVAL = 2.0    # Directory re-check period for the polling backend
+
+# Partial downloads: the browser renames them when done, which we'll see
+IGNORED_SUFFIXES = (".part", ".crdownload", ".download", ".tmp", ".partial", "~")
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+_WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+               | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; then len bytes of name
+
+
+def _ignored(name: str) -> bool:
+    return name.startswith(".") or name.endswith(IGNORED_SUFFIXES)
+
+
+def _walk_dirs(root: str, exclude: set[str]) -> Iterator[str]:
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        if os.path.abspath(path) in exclude:
+            continue
+        yield path
+        try:
+            with os.scandir(path) as it:
+                stack.extend(e.path for e in it if e.is_dir(follow_symlinks=False))
+        except OSError:
+            pass
+
+
+class _InotifyBackend:
+    """Recursive inotify watch. Raises OSError if inotify is unavailable."""
+
+    name = "inotify"
+
+    def __init__(self, root: str, exclude: set[str]):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._exclude = exclude
+        self._dirs: dict[int, str] = {}
+        self._root = root
+        try:
+            for path in _walk_dirs(root, exclude):
+                self._add(path)
+        except BaseException:
+            os.close(self._fd)  # The caller falls back to polling: don't leak the fd
+            raise
+
+    def _add(self, path: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:  # fs.inotify.max_user_watches
+                raise OSError(err, "inotify watch limit reached")
+            return  # Directory vanished or is unreadable
+        self._dirs[wd] = path
+
+    def _add_tree(self, path: str) -> Iterator[tuple[str, bool]]:
+        """Watches a new directory and reports the files already in it."""
+        for directory in _walk_dirs(path, self._exclude):
+            self._add(directory)
+            try:
+                with os.scandir(directory) as it:
+                    for e in it:
+                        if e.is_file(follow_symlinks=False):
+                            yield e.path, False
+            except OSError:
+                pass
+
+    def wait(self, timeout: float) -> list[tuple[str, bool]]:
+        """Returns (path, closed) pairs for activity on files."""
+        ready, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 1 << 16)
+        except BlockingIOError:
+            return []
+
+        events: list[tuple[str, bool]] = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                logger.warning("inotify queue overflowed, rescanning for recent files")
+                events.extend(self._recent_files())
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    events.extend(self._add_tree(path))
+            else:
+                events.append((path, bool(mask & (IN_CLOSE_WRITE | IN_MOVED_TO))))
+        return events
+
+    def _recent_files(self, window: float = 60.0) -> list[tuple[str, bool]]:
+        cutoff = time.time() - window
+        found = []
+        for directory in _walk_dirs(self._root, self._exclude):
+            try:
+                with os.scandir(directory) as it:
+                    for e in it:
+                        if e.is_file(follow_symlinks=False) and e.stat().st_mtime >= cutoff:
+                            found.append((e.path, False))
+            except OSError:
+                pass
+        return found
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _PollingBackend:
+    """
+    Portable fallback: stats every known directory each interval and
+    re-lists only those whose mtime changed.
+    """
+
+    name = "polling"
+
+    def __init__(self, root: str, exclude: set[str], interval: float = POLL_INTERVAL):
+        self._exclude = exclude
+        self._interval = interval
+        self._next_poll = 0.0
+        # dir → (mtime_ns, file names, subdirectory paths)
+        self._dirs: dict[str, tuple[int, set[str], set[str]]] = {}
+        for path in _walk_dirs(root, exclude):
+            self._list(path)
+
+    def _list(self, path: str) -> tuple[set[str], set[str]] | None:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            self._dirs.pop(path, None)
+            return None
+        names = {e.name for e in entries if not e.is_dir(follow_symlinks=False)}
+        subdirs = {
+            e.path for e in entries
+            if e.is_dir(follow_symlinks=False) and os.path.abspath(e.path) not in self._exclude
+        }
+        self._dirs[path] = (mtime, names, subdirs)
+        return names, subdirs
+
+    def wait(self, timeout: float) -> list[tuple[str, bool]]:
+        delay = min(max(timeout, 0), max(self._next_poll - time.monotonic(), 0))
+        time.sleep(delay)
+        if time.monotonic() < self._next_poll:
+            return []
+        self._next_poll = time.monotonic() + self._interval
+
+        events: list[tuple[str, bool]] = []
+        pending = list(self._dirs)
+        while pending:
+            path = pending.pop()
+            old = self._dirs.get(path)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                self._dirs.pop(path, None)
+                continue
+            if old is not None and old[0] == mtime:
+                continue
+            listed = self._list(path)
+            if listed is None:
+                continue
+            names, subdirs = listed
+            old_names, old_subdirs = (old[1], old[2]) if old else (set(), set())
+            events.extend((os.path.join(path, n), False) for n in names - old_names)
+            pending.extend(subdirs - old_subdirs)  # New folders: list them now too
+        return events
+
+    def close(self) -> None:
+        pass
+
+
+class Watcher:
+    """
+    Watches source_dir and moves each new file into output_dir/Category/
+    once it has finished being written. Files present at start are left
+    alone (run a normal organize for those).
+    on_result(result) is called for every move result, then
+    on_batch(results) once per batch (e.g. to flush a log). placement (a
+    placement.PlacementPolicy) chooses folders as in organize_files.
+    """
+
+    def __init__(self, source_dir: str, output_dir: str, dry_run: bool = False,
+                 settle_seconds: float = SETTLE_SECONDS,
+                 batch_seconds: float = BATCH_SECONDS,
+                 poll_interval: float = POLL_INTERVAL,
+                 use_inotify: bool | None = None,
+                 workers: int = MAX_WORKERS,
+                 on_result: Callable[[dict], None] | None = None,
+                 placement=None,
+                 on_batch: Callable[[list[dict]], None] | None = None):
+        if not os.path.isdir(source_dir):
+            raise ValueError(f"Path does not exist or is not a directory: {source_dir}")
+        self.source_dir = source_dir
+        self.output_dir = output_dir
+        self.dry_run = dry_run
+        self.settle_seconds = settle_seconds
+        self.batch_seconds = batch_seconds
+        self.workers = workers
+        self.on_result = on_result
+        self.on_batch = on_batch
+
+        # path → [deadline, (size, mtime_ns) at the last check or None]
+        self._pending: dict[str, list] = {}
+        self._counters: dict[str, int] = {}
+        self._planner = _MovePlanner(output_dir, placement, dry_run=dry_run)
+        self._stop = threading.Event()
+
+        exclude = {os.path.abspath(output_dir)}
+        if placement is not None:  # Other tiers may live inside the source too
+            exclude.update(os.path.abspath(d) for d in placement.tier_dirs())
+        if use_inotify is None:
+            use_inotify = sys.platform.startswith("linux")
+        self.backend = None
+        if use_inotify:
+            try:
+                self.backend = _InotifyBackend(source_dir, exclude)
+            except (OSError, AttributeError) as e:  # No libc symbol / watch limit
+                logger.warning(f"inotify unavailable ({e}), falling back to polling")
+        if self.backend is None:
+            self.backend = _PollingBackend(source_dir, exclude, poll_interval)
+
+    def stop(self) -> None:
+        """Makes run() return after the current batch (safe from any thread)."""
+        self._stop.set()
+
+    def run(self) -> None:
+        logger.info(f"Watching {self.source_dir} ({self.backend.name})")
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                next_due = min((p[0] for p in self._pending.values()), default=now + 1.0)
+                for path, closed in self.backend.wait(min(next_due - now, 1.0)):
+                    self._touch(path, closed)
+                ready = self._ready()
+                if ready:
+                    self.process(ready)
+        finally:
+            self.backend.close()
+
+    def _touch(self, path: str, closed: bool) -> None:
+        if _ignored(os.path.basename(path)):
+            return
+        delay = self.batch_seconds if closed else self.settle_seconds
+        self._pending[path] = [time.monotonic() + delay, None]
+
+    def _ready(self) -> list[str]:
+        """Pops every due file whose size and mtime held still for a batch window."""
+        now = time.monotonic()
+        ready = []
+        for path, entry in list(self._pending.items()):
+            if entry[0] > now:
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                del self._pending[path]  # Gone again (temp file, moved away)
+                continue
+            signature = (st.st_size, st.st_mtime_ns)
+            if entry[1] != signature:
+                entry[0], entry[1] = now + self.batch_seconds, signature
+                continue
+            del self._pending[path]
+            ready.append(path)
+        return ready
+
+    def process(self, paths: list[str]) -> list[dict]:
+        """Classifies, names and moves one batch of settled files."""
+        moves = []
+        for path in paths:
+            try:
+                f = path_record(path)
+            except OSError:
+                continue
+            f["category"] = classify_file(f)
+            cat = f["category"]
+            self._counters[cat] = self._counters.get(cat, 0) + 1
+            f["new_name"] = generate_name(f, self._counters[cat])
+            if self.dry_run:
+                moves.append((f, os.path.join(self._planner.directory(f), f["new_name"]), False))
+                continue
+            dest_path, same_device = self._planner.plan(f)
+            while os.path.exists(dest_path):  # Placed there after the folder was listed
+                dest_path, same_device = self._planner.plan(f)
+            moves.append((f, dest_path, same_device))
+
+        if self.dry_run:
+            results = [{
+                "original": f["path"], "destination": dest, "category": f["category"],
+                "size_bytes": f["size_bytes"], "status": "dry_run",
+            } for f, dest, _ in moves]
+        elif moves:
+            with ThreadPoolExecutor(max_workers=max(min(self.workers, len(moves)), 1)) as pool:
+                results = list(pool.map(lambda move: _move_single(*move), moves))
+        else:
+            results = []
+
+        if results:
+            logger.info(f"Watch batch: {len(results)} files")
+        if self.on_result is not None:
+            for result in results:
+                self.on_result(result)
+        if results and self.on_batch is not None:
+            self.on_batch(results)
+        return results